@@ -0,0 +1,41 @@
+"""
+Exceptions raised by the crypto payments service.
+
+Each exception keeps the values that caused it as attributes and formats its
+message only when converted to a string.
+"""
+
+
+class InvoiceNotFound(LookupError):
+    """Raised when an invoice does not exist in the invoice repository."""
+
+    def __init__(self, invoice_id: int):
+        super().__init__(invoice_id)
+        self.invoice_id = invoice_id
+
+    def __str__(self) -> str:
+        return f"Invoice with ID {self.invoice_id} not found"
+
+
+class WalletNotFound(LookupError):
+    """Raised when a user has no wallet on a network."""
+
+    def __init__(self, user_id: int, network: str):
+        super().__init__(user_id, network)
+        self.user_id = user_id
+        self.network = network
+
+    def __str__(self) -> str:
+        return f"Wallet not found for user {self.user_id} and network {self.network}"
+
+
+class ExchangeRateUnavailable(RuntimeError):
+    """Raised when no exchange rate can be obtained for a currency pair."""
+
+    def __init__(self, fiat_currency: str, crypto_currency: str):
+        super().__init__(fiat_currency, crypto_currency)
+        self.fiat_currency = fiat_currency
+        self.crypto_currency = crypto_currency
+
+    def __str__(self) -> str:
+        return f"Exchange rate not available for {self.fiat_currency}/{self.crypto_currency}"
@@ -5,7 +5,7 @@ Defines the contract for blockchain transaction monitoring and network operation
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from cryptopay.models import Transaction, Wallet, Invoice
 
@@ -20,7 +20,9 @@ class BlockchainReader(ABC):
     
     **Key Operations:**
     - Search new transactions for wallet addresses
+    - Search new transactions for many wallets in one call
     - Get network status
+    - Get current block number
     """
     
     @abstractmethod
@@ -44,6 +46,35 @@ class BlockchainReader(ABC):
         """
         pass
     
+
+    def search_transactions_for_wallets(
+        self,
+        wallets_with_invoices: List[Tuple[Wallet, Invoice]]
+    ) -> Dict[int, Transaction]:
+        """
+        Search for transactions matching many invoices in a single batched operation.
+        
+        The default implementation calls `search_transactions_for_wallet` once per pair.
+        
+        Implementations should fetch data for all wallets at once (e.g. one batched
+        RPC request or one API call) instead of one request per wallet.
+        
+        Args:
+            wallets_with_invoices: Pairs of wallet and invoice to search transactions for
+            
+        Returns:
+            Mapping of invoice ID to the found transaction (invoices without
+            a matching transaction are omitted)
+            
+        Raises:
+            Exception: If blockchain operation fails
+        """
+        transactions = {}
+        for wallet, invoice in wallets_with_invoices:
+            transaction = self.search_transactions_for_wallet(wallet, invoice)
+            if transaction:
+                transactions[invoice.id] = transaction
+        return transactions
     
     @abstractmethod
     def is_network_available(self, network: str) -> bool:
@@ -61,3 +92,20 @@ class BlockchainReader(ABC):
         """
         pass
 
+    def get_current_block(self, network: str) -> Optional[int]:
+        """
+        Get the current block number (chain tip) of a network.
+        
+        Used to skip transaction lookups while the chain has not advanced. The default
+        implementation returns None (tip unknown), so no lookup is ever skipped.
+        
+        Args:
+            network: The blockchain network to check
+            
+        Returns:
+            The latest block number known to the reader, None if unknown
+            
+        Raises:
+            Exception: If blockchain operation fails
+        """
+        return None
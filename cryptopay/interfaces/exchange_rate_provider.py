@@ -5,7 +5,7 @@ Defines the contract for retrieving exchange rates from external sources.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 
 from cryptopay.models import ExchangeRate
 
@@ -19,6 +19,7 @@ class ExchangeRateProvider(ABC):
     
     **Key Operations:**
     - Get exchange rate for currency pairs
+    - Get exchange rates for many currency pairs at once
     - Get supported fiat and crypto currencies
     """
     
@@ -39,6 +40,27 @@ class ExchangeRateProvider(ABC):
         """
         pass
     
+    def get_exchange_rates(self, pairs: List[Tuple[str, str]]) -> List[ExchangeRate]:
+        """
+        Get exchange rates for many pairs (fiat/crypto) in a single request.
+        
+        The default implementation calls `get_exchange_rate` once per pair; providers
+        with a batch endpoint should override it.
+        
+        Args:
+            pairs: The (fiat_currency, crypto_currency) pairs, e.g. [("USD", "BTC")]
+            
+        Returns:
+            List of ExchangeRate instances for the pairs
+            
+        Raises:
+            Exception: If rate retrieval fails
+        """
+        return [
+            self.get_exchange_rate(fiat_currency, crypto_currency)
+            for fiat_currency, crypto_currency in pairs
+        ]
+    
     @abstractmethod
     def get_supported_fiat_currencies(self) -> List[str]:
         """
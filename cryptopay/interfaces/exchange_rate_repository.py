@@ -21,6 +21,7 @@ class ExchangeRateRepository(ABC):
     **Key Operations:**
     - Get saved exchange rate by fiat_currency and crypto_currency
     - Update exchange rate (last_updated_at, rate, reverted_rate)
+    - Save many exchange rates (bulk)
     - Retrieve exchange rates by currency pairs
     """
     
@@ -84,6 +85,24 @@ class ExchangeRateRepository(ABC):
         """
         pass
 
+    def save_exchange_rates(self, exchange_rates: List[ExchangeRate]) -> List[ExchangeRate]:
+        """
+        Save many exchange rates to storage in a single operation.
+        
+        The default implementation calls `save_exchange_rate` once per rate; override it
+        to save all rates in one round-trip.
+        
+        Args:
+            exchange_rates: The exchange rate instances to save
+            
+        Returns:
+            The saved exchange rates with updated IDs if needed
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        return [self.save_exchange_rate(exchange_rate) for exchange_rate in exchange_rates]
+
     @abstractmethod
     def get_exchange_rates_by_crypto_currency(self, crypto_currency: str) -> List[ExchangeRate]:
         """
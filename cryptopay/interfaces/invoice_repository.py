@@ -4,11 +4,12 @@ Invoice repository interface.
 Defines the contract for invoice storage and management operations.
 """
 
+import heapq
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Dict, Iterator, Optional, List, Tuple
 
 from cryptopay.enums import InvoiceStatus
-from cryptopay.models import Invoice
+from cryptopay.models import Invoice, Transaction, Wallet
 
 
 class InvoiceRepository(ABC):
@@ -20,10 +21,30 @@ class InvoiceRepository(ABC):
     
     **Key Operations:**
     - Save created invoice
+    - Save many created invoices (bulk)
     - Update invoice status
+    - Update status of many invoices (bulk)
+    - Update status of many still PENDING invoices (bulk, status-guarded)
+    - Finalize payment (record transaction and mark invoice PAID)
+    - Finalize many payments (bulk)
     - Retrieve invoice by ID
-    - Get invoices by user
+    - Retrieve invoice together with its wallet
+    - Retrieve invoices by IDs (bulk)
+    - Get invoices by user (streamed or paginated)
+    - Get invoices by status (optionally on one network)
     - Get expired invoices
+
+    **SQL Implementations:**
+    Every query must run as a prepared statement so the database parses and plans
+    it once per connection instead of once per call. `get_invoice_with_wallet`,
+    `finalize_payment` and `update_invoice_status` run on status checks of PENDING
+    invoices and are the queries this matters most for; `get_invoice_by_id` serves
+    `get_invoice_status`. Drivers that prepare automatically
+    (asyncpg) satisfy this as long as the SQL text is constant. Other drivers
+    (psycopg 3) must prepare explicitly, e.g. keep a per-connection
+    `_stmt_cache: dict[str, PreparedStatement]` filled by `connection.prepare(sql)`
+    on first use. Never build SQL by formatting values into the query text; pass
+    them as parameters so the statement can be reused.
     """
 
     @abstractmethod
@@ -42,6 +63,24 @@ class InvoiceRepository(ABC):
         """
         pass
 
+    def save_invoices(self, invoices: List[Invoice]) -> List[Invoice]:
+        """
+        Save many created invoices to storage in a single operation.
+        
+        The default implementation calls `save_invoice` once per invoice; override it to
+        save all invoices in one round-trip.
+        
+        Args:
+            invoices: The invoice instances to save
+            
+        Returns:
+            The saved invoices with updated IDs if needed
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        return [self.save_invoice(invoice) for invoice in invoices]
+
     @abstractmethod
     def update_invoice_status(self, invoice_id: int, status: InvoiceStatus) -> Invoice:
         """
@@ -59,6 +98,101 @@ class InvoiceRepository(ABC):
         """
         pass
 
+    def update_invoice_statuses(self, invoice_ids: List[int], status: InvoiceStatus) -> List[Invoice]:
+        """
+        Update status of many invoices in a single operation.
+        
+        The default implementation calls `update_invoice_status` once per found invoice;
+        override it to update all invoices in one round-trip.
+        
+        Args:
+            invoice_ids: The invoice identifiers
+            status: The new status to set
+            
+        Returns:
+            List of updated invoices (missing identifiers are skipped)
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        return [
+            self.update_invoice_status(invoice.id, status)
+            for invoice in self.get_invoices_by_ids(invoice_ids)
+        ]
+
+    def update_pending_invoice_statuses(self, invoice_ids: List[int], status: InvoiceStatus) -> List[Invoice]:
+        """
+        Update status of many invoices that are still PENDING in a single operation.
+        
+        Invoices that left PENDING in the meantime (e.g. were paid concurrently) keep
+        their status. SQL storage should do this atomically, e.g.
+        `UPDATE invoices SET status = $2 WHERE id = ANY($1) AND status = 'PENDING'
+        RETURNING *`. The default implementation checks the status before updating
+        and is not atomic; override it when invoices can be paid concurrently.
+        
+        Args:
+            invoice_ids: The invoice identifiers
+            status: The new status to set
+            
+        Returns:
+            List of updated invoices (missing and no longer PENDING identifiers are skipped)
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        pending_ids = [
+            invoice.id for invoice in self.get_invoices_by_ids(invoice_ids)
+            if invoice.status == InvoiceStatus.PENDING
+        ]
+        return self.update_invoice_statuses(pending_ids, status) if pending_ids else []
+
+    @abstractmethod
+    def finalize_payment(self, invoice_id: int, transaction: Transaction) -> Optional[Invoice]:
+        """
+        Record the paying transaction and mark the invoice PAID in a single atomic operation.
+        
+        The transaction is saved only if the invoice is still PENDING and no transaction
+        with the same hash and network is stored yet. SQL storage can do this in one
+        round-trip, e.g. a CTE selecting the PENDING invoice `FOR UPDATE`, inserting the
+        transaction `ON CONFLICT DO NOTHING` and updating the invoice `RETURNING *`.
+        
+        Args:
+            invoice_id: The invoice identifier
+            transaction: The transaction paying the invoice
+            
+        Returns:
+            The updated invoice if the payment was recorded, None if the invoice is not
+            PENDING or the transaction was already recorded
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        pass
+
+    def finalize_payments(self, payments: Dict[int, Transaction]) -> List[Invoice]:
+        """
+        Record many paying transactions and mark their invoices PAID.
+        
+        Every payment is finalized with the same guarantee as `finalize_payment`.
+        The default implementation calls `finalize_payment` once per invoice; SQL
+        storage can override it to finalize all payments in one round-trip.
+        
+        Args:
+            payments: The transaction paying each invoice, by invoice identifier
+            
+        Returns:
+            List of updated invoices whose payment was recorded
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        paid_invoices = []
+        for invoice_id, transaction in payments.items():
+            paid_invoice = self.finalize_payment(invoice_id, transaction)
+            if paid_invoice:
+                paid_invoices.append(paid_invoice)
+        return paid_invoices
+
     @abstractmethod
     def get_invoice_by_id(self, invoice_id: int) -> Optional[Invoice]:
         """
@@ -75,38 +209,136 @@ class InvoiceRepository(ABC):
         """
         pass
 
+    def get_invoice_with_wallet(self, invoice_id: int) -> Optional[Tuple[Invoice, Optional[Wallet]]]:
+        """
+        Get invoice by its unique identifier together with the wallet of its owner
+        on the invoice network, in a single operation.
+        
+        The default implementation returns the invoice of `get_invoice_by_id` without a
+        wallet, so the service looks the wallet up separately.
+        
+        SQL implementations should fetch both in one round-trip, e.g.
+        `SELECT i.*, w.* FROM invoices i LEFT JOIN wallets w
+        ON w.user_id = i.user_id AND w.network = i.network WHERE i.id = $1`.
+        
+        Args:
+            invoice_id: The invoice identifier
+            
+        Returns:
+            Tuple of the invoice and its wallet (None if the user has no wallet
+            on the network) if the invoice is found, None otherwise
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        invoice = self.get_invoice_by_id(invoice_id)
+        return (invoice, None) if invoice else None
+
+    def get_invoices_by_ids(self, invoice_ids: List[int]) -> List[Invoice]:
+        """
+        Get invoices by their unique identifiers in a single operation.
+        
+        The default implementation calls `get_invoice_by_id` once per identifier.
+        
+        Args:
+            invoice_ids: The invoice identifiers
+            
+        Returns:
+            List of found invoice instances (missing identifiers are skipped)
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        invoices = (self.get_invoice_by_id(invoice_id) for invoice_id in invoice_ids)
+        return [invoice for invoice in invoices if invoice]
+
     @abstractmethod
-    def get_invoices_by_user(self, user_id: int) -> List[Invoice]:
+    def get_invoices_by_user(self, user_id: int) -> Iterator[Invoice]:
         """
         Get all invoices for a specific user.
         
+        Invoices may be streamed (e.g. from a server-side cursor), so callers
+        should not rely on the whole result being loaded at once.
+        
         Args:
             user_id: The user identifier
             
         Returns:
-            List of invoice instances for the user
+            Iterator over invoice instances for the user
             
         Raises:
             Exception: If database operation fails
         """
         pass
 
+    def get_invoices_by_user_page(
+        self,
+        user_id: int,
+        limit: int,
+        after_id: Optional[int] = None
+    ) -> List[Invoice]:
+        """
+        Get one page of invoices for a specific user, ordered by ID (keyset pagination).
+        
+        The default implementation pages through `get_invoices_by_user` in memory;
+        override it with an indexed
+        `WHERE user_id = $1 AND id > $2 ORDER BY id LIMIT $3` query.
+        
+        Args:
+            user_id: The user identifier
+            limit: Maximum number of invoices to return
+            after_id: Return only invoices with ID greater than this one (first page if None)
+            
+        Returns:
+            List of at most `limit` invoice instances for the user
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        invoices = (
+            invoice for invoice in self.get_invoices_by_user(user_id)
+            if after_id is None or invoice.id > after_id
+        )
+        return heapq.nsmallest(limit, invoices, key=lambda invoice: invoice.id)
+
     @abstractmethod
-    def get_invoices_by_status(self, status: InvoiceStatus) -> List[Invoice]:
+    def get_invoices_by_status(self, status: InvoiceStatus) -> Iterator[Invoice]:
         """
         Get all invoices with a specific status.
         
+        Invoices may be streamed (e.g. from a server-side cursor), so callers
+        should not rely on the whole result being loaded at once.
+        
         Args:
             status: The invoice status to filter by
             
         Returns:
-            List of invoice instances with the specified status
+            Iterator over invoice instances with the specified status
             
         Raises:
             Exception: If database operation fails
         """
         pass
 
+    def get_invoices_by_status_and_network(self, status: InvoiceStatus, network: str) -> Iterator[Invoice]:
+        """
+        Get all invoices with a specific status on a specific network.
+        
+        The default implementation filters `get_invoices_by_status`; SQL storage should
+        override it with an indexed `WHERE status = $1 AND network = $2` query.
+        
+        Args:
+            status: The invoice status to filter by
+            network: The blockchain network to filter by
+            
+        Returns:
+            Iterator over invoice instances with the specified status and network
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        return (invoice for invoice in self.get_invoices_by_status(status) if invoice.network == network)
+
     @abstractmethod
     def get_expired_invoices(self, current_timestamp: int) -> List[Invoice]:
         """
@@ -46,7 +46,7 @@ class NetworkClient(ABC):
     @abstractmethod
     def transfer_amount(
             self,
-            private_key: bytes,
+            private_key: bytearray,
             to_address: str,
             amount: Decimal,
             **kwargs
@@ -55,7 +55,10 @@ class NetworkClient(ABC):
         Transfer amount by private key.
         
         Args:
-            private_key: The private key for the sender wallet
+            private_key: The raw private key bytes for the sender wallet, as returned
+                by `generate_wallet`; clients needing another encoding (e.g. hex)
+                convert it themselves. The buffer is zeroed once the call returns,
+                so clients must not keep a reference to it
             to_address: The recipient address
             amount: The amount to transfer
             **kwargs: Additional network-specific parameters (gas_price, gas_limit, etc.)
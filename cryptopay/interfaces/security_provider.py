@@ -5,7 +5,7 @@ Defines the contract for secure storage operations including encryption and decr
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
 
 class SecurityProvider(ABC):
@@ -18,6 +18,7 @@ class SecurityProvider(ABC):
     **Key Operations:**
     - Encrypt bytes (for private key storage)
     - Decrypt bytes (for private key retrieval)
+    - Encrypt many items at once (for bulk wallet operations)
     """
     
     @abstractmethod
@@ -65,3 +66,20 @@ class SecurityProvider(ABC):
             Exception: If operation fails
         """
         pass
+
+    def encrypt_many(self, items: List[bytes]) -> List[bytes]:
+        """
+        Encrypt many byte strings in a single operation.
+        
+        The default implementation calls `encrypt_bytes` once per item.
+        
+        Args:
+            items: The bytes to encrypt (e.g., private keys of generated wallets)
+            
+        Returns:
+            Encrypted bytes in the order of items
+            
+        Raises:
+            Exception: If encryption fails
+        """
+        return [self.encrypt_bytes(item) for item in items]
@@ -22,6 +22,12 @@ class TransactionRepository(ABC):
     - Get transaction by hash and network
     - Retrieve transactions by invoice
     - Get transaction by ID
+
+    **SQL Implementations:**
+    Every query must run as a prepared statement, cached once per connection, as
+    described for `InvoiceRepository`. Status checks do not query this repository
+    directly: the duplicate check and insert of a paying transaction run inside
+    `InvoiceRepository.finalize_payment`, so that statement is the hot one.
     """
 
     @abstractmethod
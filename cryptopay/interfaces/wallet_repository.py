@@ -5,7 +5,7 @@ Defines the contract for wallet storage and retrieval operations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, List, Optional
 
 from cryptopay.models import Wallet
 
@@ -19,6 +19,9 @@ class WalletRepository(ABC):
     
     **Key Operations:**
     - Get wallet for user by network
+    - Get wallets for many users by network (bulk)
+    - Get wallet for user by network or create it atomically
+    - Get wallets for many users by network or create them atomically (bulk)
     - Save generated wallet
     - Retrieve wallet by ID
     - Update wallet information
@@ -41,6 +44,89 @@ class WalletRepository(ABC):
         """
         pass
 
+    def get_wallets_for_users(self, user_ids: List[int], network: str) -> List[Wallet]:
+        """
+        Get wallets for many users on a network in a single operation.
+        
+        The default implementation calls `get_wallet_for_user` once per user.
+        
+        Args:
+            user_ids: The user identifiers
+            network: The blockchain network (e.g., "erc20", "bsc", "solana")
+            
+        Returns:
+            List of found wallet instances (users without a wallet are skipped)
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        wallets = (self.get_wallet_for_user(user_id, network) for user_id in dict.fromkeys(user_ids))
+        return [wallet for wallet in wallets if wallet]
+
+    @abstractmethod
+    def get_or_create_wallet(
+        self,
+        user_id: int,
+        network: str,
+        wallet_factory: Callable[[], Wallet]
+    ) -> Wallet:
+        """
+        Get wallet for user based on user_id and network, creating it if missing.
+        
+        Must be atomic: concurrent callers for the same user and network get the
+        same wallet (e.g. `INSERT ... ON CONFLICT DO NOTHING RETURNING` in SQL storage).
+        `wallet_factory` is called only when no wallet exists yet.
+        
+        Args:
+            user_id: The user identifier
+            network: The blockchain network (e.g., "erc20", "bsc", "solana")
+            wallet_factory: Callable generating a new, not yet saved wallet
+            
+        Returns:
+            The existing or newly saved wallet instance
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        pass
+
+    def get_or_create_wallets(
+        self,
+        user_ids: List[int],
+        network: str,
+        wallets_factory: Callable[[List[int]], List[Wallet]]
+    ) -> List[Wallet]:
+        """
+        Get wallets for many users based on user_ids and network, creating the missing ones.
+        
+        Must be atomic per user like `get_or_create_wallet`. The default implementation
+        reads existing wallets with `get_wallets_for_users`, generates all missing ones by
+        a single `wallets_factory` call and stores each through `get_or_create_wallet`, so
+        a wallet created concurrently wins and the generated one is discarded. SQL storage
+        can override it with one `INSERT ... ON CONFLICT DO NOTHING` and a re-read of the
+        users whose wallets were not inserted.
+        
+        Args:
+            user_ids: The user identifiers
+            network: The blockchain network (e.g., "erc20", "bsc", "solana")
+            wallets_factory: Callable generating new, not yet saved wallets for the given
+                user identifiers
+            
+        Returns:
+            The existing or newly saved wallet of every user
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        wallets = {wallet.user_id: wallet for wallet in self.get_wallets_for_users(user_ids, network)}
+        missing_user_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in wallets]
+        if missing_user_ids:
+            for new_wallet in wallets_factory(missing_user_ids):
+                wallets[new_wallet.user_id] = self.get_or_create_wallet(
+                    new_wallet.user_id, network, lambda wallet=new_wallet: wallet
+                )
+        return list(wallets.values())
+
     @abstractmethod
     def save_wallet(self, wallet: Wallet) -> Wallet:
         """
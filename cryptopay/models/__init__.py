@@ -3,11 +3,13 @@ from .invoice import Invoice
 from .transaction import Transaction
 from .exchange_rate import ExchangeRate
 from .wallet_credentials import WalletCredentials
+from .fiat_invoice_request import FiatInvoiceRequest
 
 __all__ = [
     "Wallet",
     "Invoice",
     "Transaction",
     "ExchangeRate",
-    "WalletCredentials"
+    "WalletCredentials",
+    "FiatInvoiceRequest",
 ]
@@ -0,0 +1,67 @@
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class FiatInvoiceRequest(BaseModel):
+    """
+    Represents a request to create a fiat invoice as part of a bulk operation.
+
+    Holds the same arguments as `CryptoPaymentsService.create_fiat_invoice` so that
+    many invoices can be created with `CryptoPaymentsService.create_fiat_invoices`.
+
+    **Usage Examples:**
+    ```python
+    # Request an invoice for 100 USD paid on the erc20 network
+    request = FiatInvoiceRequest(
+        user_id=123,
+        network="erc20",
+        fiat_amount=Decimal("100.00"),
+        fiat_currency="USD",
+        expires_at=1641081600
+    )
+    ```
+
+    **Relationships:**
+    - Used by CryptoPaymentsService for bulk invoice creation
+    - Turned into one Invoice
+    """
+
+    user_id: int = Field(..., description="Identifier of the user who will own the invoice")
+    network: str = Field(..., description="Blockchain network where transactions should be searched")
+    fiat_amount: Decimal = Field(..., gt=0, description="Amount of the bill in fiat currency")
+    fiat_currency: str = Field(..., description="Fiat currency code (e.g., 'USD', 'EUR')")
+    expires_at: Optional[int] = Field(None, description="Unix timestamp when invoice will expire (optional)")
+
+    @field_validator("fiat_currency")
+    @classmethod
+    def validate_fiat_currency(cls, v: str) -> str:
+        """
+        Validate that fiat currency is not empty and normalize to uppercase.
+
+        Args:
+            v: The fiat currency code to validate
+
+        Returns:
+            The normalized fiat currency code
+
+        Raises:
+            ValueError: If the currency code is empty
+        """
+        if not v or not v.strip():
+            raise ValueError("Fiat currency cannot be empty")
+        return v.strip().upper()
+
+    class Config:
+        """Pydantic configuration for the FiatInvoiceRequest model."""
+        json_schema_extra = {
+            "example": {
+                "user_id": 123,
+                "network": "erc20",
+                "fiat_amount": "100.00",
+                "fiat_currency": "USD",
+                "expires_at": 1641081600
+            },
+            "description": "A request to create a fiat invoice in bulk"
+        }
@@ -29,6 +29,10 @@ class InMemoryExchangeRateRepository(ExchangeRateRepository):
         self._exchange_rates[key] = exchange_rate
         return exchange_rate
 
+    def save_exchange_rates(self, exchange_rates: List[ExchangeRate]) -> List[ExchangeRate]:
+        """Saves many exchange rates to the repository."""
+        return [self.save_exchange_rate(exchange_rate) for exchange_rate in exchange_rates]
+
     def get_exchange_rate(
         self, fiat_currency: str, crypto_currency: str
     ) -> Optional[ExchangeRate]:
@@ -2,11 +2,16 @@
 In-memory implementation of the InvoiceRepository interface.
 """
 
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from cryptopay.enums import InvoiceStatus
 from cryptopay.interfaces.invoice_repository import InvoiceRepository
+from cryptopay.interfaces.transaction_repository import TransactionRepository
+from cryptopay.interfaces.wallet_repository import WalletRepository
 from cryptopay.models.invoice import Invoice
+from cryptopay.models.transaction import Transaction
+from cryptopay.models.wallet import Wallet
 
 
 class InMemoryInvoiceRepository(InvoiceRepository):
@@ -14,58 +19,180 @@ class InMemoryInvoiceRepository(InvoiceRepository):
     In-memory implementation of the InvoiceRepository.
 
     This repository stores invoices in a dictionary for testing and development purposes.
+    Invoices are additionally indexed by user, by status and by status and network, so
+    filtered lookups do not scan all stored invoices. The repository stores and returns copies, so changing a
+    returned invoice in place never leaves the indexes stale; save or update it instead.
+
+    Payments finalized by `finalize_payment` are recorded in `transaction_repository`,
+    which must be the repository used by the service so both see the same transactions.
+    `finalize_payment` and `update_pending_invoice_statuses` hold the same lock, so
+    concurrent payments with the same transaction are recorded only once and a paid
+    invoice is never marked expired.
+
+    Wallets returned by `get_invoice_with_wallet` are looked up in `wallet_repository`;
+    without one, invoices are returned without a wallet.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        transaction_repository: TransactionRepository,
+        wallet_repository: Optional[WalletRepository] = None,
+    ):
         self._invoices: Dict[int, Invoice] = {}
         self._next_id = 1
+        self._transaction_repository = transaction_repository
+        self._status_lock = threading.Lock()
+        self._wallet_repository = wallet_repository
+
+        # Secondary indexes: key -> invoice IDs
+        self._by_user: Dict[int, Set[int]] = {}
+        self._by_status: Dict[InvoiceStatus, Set[int]] = {}
+        self._by_status_and_network: Dict[Tuple[InvoiceStatus, str], Set[int]] = {}
+        # Index keys each invoice is currently stored under
+        self._index_keys: Dict[int, Tuple[int, InvoiceStatus, str]] = {}
+
+    @property
+    def transaction_repository(self) -> TransactionRepository:
+        """The repository payments finalized by `finalize_payment` are recorded in."""
+        return self._transaction_repository
+
+    def _index(self, invoice: Invoice) -> None:
+        """Adds an invoice to the secondary indexes, replacing its previous entries."""
+        self._unindex(invoice.id)
+        status = InvoiceStatus(invoice.status)
+        self._by_user.setdefault(invoice.user_id, set()).add(invoice.id)
+        self._by_status.setdefault(status, set()).add(invoice.id)
+        self._by_status_and_network.setdefault((status, invoice.network), set()).add(invoice.id)
+        self._index_keys[invoice.id] = (invoice.user_id, status, invoice.network)
+
+    def _unindex(self, invoice_id: int) -> None:
+        """Removes an invoice from the secondary indexes."""
+        keys = self._index_keys.pop(invoice_id, None)
+        if keys is None:
+            return
+        user_id, status, network = keys
+        self._by_user[user_id].discard(invoice_id)
+        self._by_status[status].discard(invoice_id)
+        self._by_status_and_network[(status, network)].discard(invoice_id)
+
+    def _get_indexed(self, invoice_ids: Set[int]) -> Iterator[Invoice]:
+        """Retrieves indexed invoices lazily in ID order, skipping invoices deleted meanwhile."""
+        invoices = map(self._invoices.get, sorted(invoice_ids))
+        return (invoice.model_copy() for invoice in invoices if invoice is not None)
 
     def save_invoice(self, invoice: Invoice) -> Invoice:
-        """Saves an invoice to the repository."""
-        if invoice.id is None:
+        """Saves an invoice to the repository, assigning an ID if it has none (None or 0)."""
+        if not invoice.id:
             invoice.id = self._next_id
-            self._next_id += 1
-        self._invoices[invoice.id] = invoice
-        return invoice
+        self._next_id = max(self._next_id, invoice.id + 1)
+        self._invoices[invoice.id] = invoice.model_copy()
+        self._index(invoice)
+        return invoice.model_copy()
+
+    def save_invoices(self, invoices: List[Invoice]) -> List[Invoice]:
+        """Saves many invoices to the repository."""
+        return [self.save_invoice(invoice) for invoice in invoices]
 
     def get_invoice_by_id(self, invoice_id: int) -> Optional[Invoice]:
         """Retrieves an invoice by its ID."""
-        return self._invoices.get(invoice_id)
+        invoice = self._invoices.get(invoice_id)
+        return invoice.model_copy() if invoice else None
+
+    def get_invoice_with_wallet(self, invoice_id: int) -> Optional[Tuple[Invoice, Optional[Wallet]]]:
+        """Retrieves an invoice by its ID together with its owner's wallet on the invoice network."""
+        invoice = self.get_invoice_by_id(invoice_id)
+        if invoice is None:
+            return None
+        if self._wallet_repository is None:
+            return invoice, None
+        return invoice, self._wallet_repository.get_wallet_for_user(invoice.user_id, invoice.network)
+
+    def get_invoices_by_ids(self, invoice_ids: List[int]) -> List[Invoice]:
+        """Retrieves invoices by their IDs."""
+        return [self._invoices[i].model_copy() for i in invoice_ids if i in self._invoices]
 
-    def get_invoices_by_user(self, user_id: int) -> List[Invoice]:
+    def get_invoices_by_user(self, user_id: int) -> Iterator[Invoice]:
         """Retrieves all invoices for a given user."""
-        return [inv for inv in self._invoices.values() if inv.user_id == user_id]
+        return self._get_indexed(self._by_user.get(user_id, set()))
+
+    def get_invoices_by_user_page(
+        self, user_id: int, limit: int, after_id: Optional[int] = None
+    ) -> List[Invoice]:
+        """Retrieves one page of invoices for a given user."""
+        invoice_ids = sorted(
+            invoice_id
+            for invoice_id in self._by_user.get(user_id, set())
+            if after_id is None or invoice_id > after_id
+        )
+        return [self._invoices[invoice_id].model_copy() for invoice_id in invoice_ids[:limit]]
 
-    def get_invoices_by_status(self, status: InvoiceStatus) -> List[Invoice]:
+    def get_invoices_by_status(self, status: InvoiceStatus) -> Iterator[Invoice]:
         """Retrieves all invoices with a given status."""
-        return [inv for inv in self._invoices.values() if inv.status == status]
+        return self._get_indexed(self._by_status.get(InvoiceStatus(status), set()))
+
+    def get_invoices_by_status_and_network(self, status: InvoiceStatus, network: str) -> Iterator[Invoice]:
+        """Retrieves all invoices with a given status on a given network."""
+        return self._get_indexed(self._by_status_and_network.get((InvoiceStatus(status), network), set()))
 
     def get_expired_invoices(self, current_timestamp: int) -> List[Invoice]:
         """Retrieves all expired invoices."""
         return [
-            inv
+            inv.model_copy()
             for inv in self._invoices.values()
             if inv.expires_at is not None and inv.expires_at < current_timestamp
         ]
 
     def update_invoice_status(self, invoice_id: int, status: InvoiceStatus) -> Invoice:
         """Updates the status of an invoice."""
-        invoice = self.get_invoice_by_id(invoice_id)
+        invoice = self._invoices.get(invoice_id)
         if invoice:
             invoice.status = status
-            return invoice
+            self._index(invoice)
+            return invoice.model_copy()
         raise ValueError(f"Invoice with id {invoice_id} not found")
 
+    def update_invoice_statuses(self, invoice_ids: List[int], status: InvoiceStatus) -> List[Invoice]:
+        """Updates the status of many invoices."""
+        invoices = [self._invoices[i] for i in invoice_ids if i in self._invoices]
+        for invoice in invoices:
+            invoice.status = status
+            self._index(invoice)
+        return [invoice.model_copy() for invoice in invoices]
+
+    def update_pending_invoice_statuses(self, invoice_ids: List[int], status: InvoiceStatus) -> List[Invoice]:
+        """Updates the status of many invoices that are still pending."""
+        with self._status_lock:
+            pending_ids = [
+                i for i in invoice_ids
+                if i in self._invoices and self._invoices[i].status == InvoiceStatus.PENDING
+            ]
+            return self.update_invoice_statuses(pending_ids, status)
+
+    def finalize_payment(self, invoice_id: int, transaction: Transaction) -> Optional[Invoice]:
+        """Records the paying transaction and marks the invoice as paid."""
+        with self._status_lock:
+            invoice = self.get_invoice_by_id(invoice_id)
+            if invoice is None or invoice.status != InvoiceStatus.PENDING:
+                return None
+            if self._transaction_repository.get_transaction_by_hash_and_network(
+                transaction.hash, transaction.network
+            ):
+                return None
+            self._transaction_repository.save_transaction(transaction)
+            return self.update_invoice_status(invoice_id, InvoiceStatus.PAID)
+
     def update_invoice(self, invoice: Invoice) -> Invoice:
         """Updates an invoice."""
         if invoice.id is None or invoice.id not in self._invoices:
             raise ValueError(f"Invoice with id {invoice.id} not found")
-        self._invoices[invoice.id] = invoice
-        return invoice
+        self._invoices[invoice.id] = invoice.model_copy()
+        self._index(invoice)
+        return invoice.model_copy()
 
     def delete_invoice(self, invoice_id: int) -> bool:
         """Deletes an invoice."""
         if invoice_id in self._invoices:
             del self._invoices[invoice_id]
+            self._unindex(invoice_id)
             return True
         return False
@@ -2,7 +2,7 @@
 In-memory implementation of the TransactionRepository interface.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 from cryptopay.interfaces.transaction_repository import TransactionRepository
 from cryptopay.models.transaction import Transaction
@@ -13,55 +13,90 @@ class InMemoryTransactionRepository(TransactionRepository):
     In-memory implementation of the TransactionRepository.
 
     This repository stores transactions in a dictionary for testing and development purposes.
+    Transactions are additionally indexed by (hash, network) and by invoice, so lookups
+    used for duplicate detection do not scan all stored transactions. When several
+    transactions share a hash and network, lookups by both return the lowest ID. The repository
+    stores and returns copies, so changing a returned transaction in place never leaves
+    the indexes stale; update it instead.
     """
 
     def __init__(self):
         self._transactions: Dict[int, Transaction] = {}
         self._next_id = 1
 
+        # Secondary indexes: key -> transaction ID(s)
+        self._by_hash_network: Dict[Tuple[str, str], Set[int]] = {}
+        self._by_invoice: Dict[int, Set[int]] = {}
+        # Index keys each transaction is currently stored under
+        self._index_keys: Dict[int, Tuple[Tuple[str, str], int]] = {}
+
+    def _index(self, transaction: Transaction) -> None:
+        """Adds a transaction to the secondary indexes, replacing its previous entries."""
+        self._unindex(transaction.id)
+        hash_network = (transaction.hash, transaction.network)
+        self._by_hash_network.setdefault(hash_network, set()).add(transaction.id)
+        self._by_invoice.setdefault(transaction.invoice_id, set()).add(transaction.id)
+        self._index_keys[transaction.id] = (hash_network, transaction.invoice_id)
+
+    def _unindex(self, transaction_id: int) -> None:
+        """Removes a transaction from the secondary indexes."""
+        keys = self._index_keys.pop(transaction_id, None)
+        if keys is None:
+            return
+        hash_network, invoice_id = keys
+        self._by_hash_network[hash_network].discard(transaction_id)
+        self._by_invoice[invoice_id].discard(transaction_id)
+
     def save_transaction(self, transaction: Transaction) -> Transaction:
         """Saves a transaction to the repository."""
         if transaction.id is None:
             transaction.id = self._next_id
             self._next_id += 1
-        self._transactions[transaction.id] = transaction
-        return transaction
+        self._transactions[transaction.id] = transaction.model_copy()
+        self._index(transaction)
+        return transaction.model_copy()
 
     def get_transaction_by_id(self, transaction_id: int) -> Optional[Transaction]:
         """Retrieves a transaction by its ID."""
-        return self._transactions.get(transaction_id)
+        transaction = self._transactions.get(transaction_id)
+        return transaction.model_copy() if transaction else None
 
     def get_transaction_by_hash_and_network(
         self, tx_hash: str, network: str
     ) -> Optional[Transaction]:
         """Retrieves a transaction by its hash and network."""
-        for tx in self._transactions.values():
-            if tx.hash == tx_hash and tx.network == network:
-                return tx
-        return None
+        transaction_ids = self._by_hash_network.get((tx_hash, network))
+        if not transaction_ids:
+            return None
+        return self._transactions[min(transaction_ids)].model_copy()
 
     def get_transactions_by_invoice(self, invoice_id: int) -> List[Transaction]:
         """Retrieves all transactions for a given invoice."""
-        return [tx for tx in self._transactions.values() if tx.invoice_id == invoice_id]
+        return [
+            self._transactions[tx_id].model_copy()
+            for tx_id in sorted(self._by_invoice.get(invoice_id, set()))
+        ]
 
     def get_transactions_by_network(self, network: str) -> List[Transaction]:
         """Retrieves all transactions for a given network."""
-        return [tx for tx in self._transactions.values() if tx.network == network]
+        return [tx.model_copy() for tx in self._transactions.values() if tx.network == network]
 
     def get_transactions_by_hash(self, tx_hash: str) -> List[Transaction]:
         """Retrieves all transactions for a given hash."""
-        return [tx for tx in self._transactions.values() if tx.hash == tx_hash]
+        return [tx.model_copy() for tx in self._transactions.values() if tx.hash == tx_hash]
 
     def update_transaction(self, transaction: Transaction) -> Transaction:
         """Updates a transaction."""
         if transaction.id is None or transaction.id not in self._transactions:
             raise ValueError(f"Transaction with id {transaction.id} not found")
-        self._transactions[transaction.id] = transaction
-        return transaction
+        self._transactions[transaction.id] = transaction.model_copy()
+        self._index(transaction)
+        return transaction.model_copy()
 
     def delete_transaction(self, transaction_id: int) -> bool:
         """Deletes a transaction."""
         if transaction_id in self._transactions:
             del self._transactions[transaction_id]
+            self._unindex(transaction_id)
             return True
         return False
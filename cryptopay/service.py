@@ -6,8 +6,15 @@ This class orchestrates interactions between all the interfaces to provide a com
 cryptocurrency payment solution.
 """
 
+import asyncio
+import functools
+import inspect
+import logging
+import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
 from decimal import Decimal
 
 from cryptopay.models import (
@@ -16,8 +23,14 @@ from cryptopay.models import (
     Transaction,
     ExchangeRate,
     WalletCredentials,
+    FiatInvoiceRequest,
 )
 from cryptopay.enums import InvoiceStatus
+from cryptopay.exceptions import (
+    InvoiceNotFound,
+    WalletNotFound,
+    ExchangeRateUnavailable,
+)
 from cryptopay.interfaces import (
     WalletRepository,
     InvoiceRepository,
@@ -29,6 +42,25 @@ from cryptopay.interfaces import (
     ExchangeRateProvider,
 )
 
+logger = logging.getLogger(__name__)
+
+# Bounds (in seconds) of the back-off between blockchain lookups for an unpaid invoice
+MIN_CHECK_BACKOFF = 5
+MAX_CHECK_BACKOFF = 300
+
+# Default number of invoices in a final status kept in memory to answer repeat status checks
+TERMINAL_INVOICE_CACHE_SIZE = 10_000
+
+
+def _now() -> int:
+    """Get current unix timestamp in seconds without a float round-trip."""
+    return time.time_ns() // 1_000_000_000
+
+
+def _zero(buffer: bytearray) -> None:
+    """Overwrite a buffer holding secret data with zeros."""
+    buffer[:] = bytes(len(buffer))
+
 
 class CryptoPaymentsService:
     """
@@ -41,8 +73,12 @@ class CryptoPaymentsService:
     **Use Cases Implemented:**
     - Get wallet for user (with automatic generation if needed)
     - Create fiat invoice (with exchange rate conversion)
+    - Create many fiat invoices with bulk operations
+    - Warm up exchange rates for fiat invoices
     - Create crypto invoice (direct cryptocurrency payment)
     - Check invoice status (with blockchain monitoring)
+    - Check status of many invoices concurrently (async)
+    - Check all pending invoices of a network with bulk operations
 
     **Dependencies:**
     - All repository interfaces for data persistence
@@ -52,6 +88,33 @@ class CryptoPaymentsService:
     - Exchange rate provider for fiat/crypto conversions
     """
 
+    __slots__ = (
+        "wallet_repository",
+        "invoice_repository",
+        "exchange_rate_repository",
+        "transaction_repository",
+        "blockchain_reader",
+        "network_client",
+        "security_provider",
+        "exchange_rate_provider",
+        "_network_name",
+        "rate_ttl_s",
+        "_rate_cache",
+        "_last_seen_block",
+        "_last_searched_block",
+        "_next_check_at",
+        "_check_backoff",
+        "_network_locks",
+        "auto_provision_wallet",
+        "_provisioning_executor",
+        "private_key_cache_size",
+        "_private_key_cache",
+        "_private_key_lock",
+        "terminal_invoice_cache_size",
+        "_terminal_invoices",
+        "_terminal_lock",
+    )
+
     def __init__(
         self,
         wallet_repository: WalletRepository,
@@ -62,20 +125,55 @@ class CryptoPaymentsService:
         network_client: NetworkClient,
         security_provider: SecurityProvider,
         exchange_rate_provider: ExchangeRateProvider,
+        rate_ttl_s: int = 30,
+        auto_provision_wallet: bool = True,
+        private_key_cache_size: int = 0,
+        terminal_invoice_cache_size: int = TERMINAL_INVOICE_CACHE_SIZE,
     ):
         """
         Initialize the crypto payments service with all required dependencies.
 
+        The network name of `network_client` is read once here, so a client must
+        keep returning the same name for its whole lifetime.
+
         Args:
             wallet_repository: Repository for wallet operations
             invoice_repository: Repository for invoice operations
             exchange_rate_repository: Repository for exchange rate operations
-            transaction_repository: Repository for transaction operations
+            transaction_repository: Repository for transaction operations. The service
+                does not read it: payments are recorded by
+                `invoice_repository.finalize_payment`, whose duplicate check only holds if
+                this is the repository the invoice repository records payments into. It is
+                kept for callers; if `invoice_repository` exposes a `transaction_repository`
+                attribute, both must be the same object
             blockchain_reader: Reader for blockchain operations
             network_client: Client for network operations
             security_provider: Provider for security operations
             exchange_rate_provider: Provider for exchange rate operations
+            rate_ttl_s: How long (in seconds) a fetched exchange rate is reused
+                before asking the exchange rate provider again
+            auto_provision_wallet: Get or create the user's wallet before an invoice
+                is returned; if False, it is provisioned in a background thread instead
+                and status checks raise WalletNotFound until it is saved (failures are
+                logged; call `close` to stop the background threads)
+            private_key_cache_size: How many decrypted private keys to keep in memory
+                for repeated transfers (0 disables the cache); cached keys are zeroed when
+                evicted, by `clear_private_key_cache` and by `close`
+            terminal_invoice_cache_size: How many invoices in a final status (PAID, EXPIRED,
+                CANCELLED) to keep in memory, so their status checks skip all I/O (0 disables
+                the cache). The cache assumes such invoices change only through this service;
+                call `forget_invoice` after deleting or changing one elsewhere
+
+        Raises:
+            ValueError: If `invoice_repository` records payments into another transaction
+                repository than `transaction_repository`
         """
+        recording_repository = getattr(invoice_repository, "transaction_repository", transaction_repository)
+        if recording_repository is not transaction_repository:
+            raise ValueError(
+                "transaction_repository must be the repository invoice_repository records payments into"
+            )
+
         self.wallet_repository = wallet_repository
         self.invoice_repository = invoice_repository
         self.exchange_rate_repository = exchange_rate_repository
@@ -84,6 +182,35 @@ class CryptoPaymentsService:
         self.network_client = network_client
         self.security_provider = security_provider
         self.exchange_rate_provider = exchange_rate_provider
+        self._network_name = network_client.get_network_name()
+        self.rate_ttl_s = rate_ttl_s
+
+        # Exchange rates by (fiat, crypto) pair with their monotonic expiration time
+        self._rate_cache: dict[tuple[str, str], tuple[ExchangeRate, float]] = {}
+
+        # Adaptive polling state, shared by concurrent status checks: the latest known
+        # chain tip of each network and the tip each invoice was last looked up at
+        self._last_seen_block: dict[str, int] = {}
+        self._last_searched_block: dict[int, Optional[int]] = {}
+        self._next_check_at: dict[int, int] = {}
+        self._check_backoff: dict[int, int] = {}
+        self._network_locks: dict[str, threading.Lock] = {}
+
+        # Invoices in a final status (PAID, EXPIRED, CANCELLED), oldest first
+        self.terminal_invoice_cache_size = terminal_invoice_cache_size
+        self._terminal_invoices: OrderedDict[int, Invoice] = OrderedDict()
+        self._terminal_lock = threading.Lock()
+
+        self.auto_provision_wallet = auto_provision_wallet
+        self._provisioning_executor = (
+            None if auto_provision_wallet
+            else ThreadPoolExecutor(thread_name_prefix="cryptopay-wallet")
+        )
+
+        # Decrypted private keys by (wallet ID, encrypted key), least recently used first
+        self.private_key_cache_size = private_key_cache_size
+        self._private_key_cache: OrderedDict[tuple[int, bytes], bytearray] = OrderedDict()
+        self._private_key_lock = threading.Lock()
 
     def get_wallet_for_user(self, user_id: int, network: str) -> Wallet:
         """
@@ -95,6 +222,9 @@ class CryptoPaymentsService:
         3. Encrypt private_key with SecurityProvider
         4. Save it to repository
 
+        All steps run inside one atomic `WalletRepository.get_or_create_wallet` call,
+        so concurrent callers never create two wallets for the same user and network.
+
         Args:
             user_id: The user identifier
             network: The blockchain network (e.g., "erc20", "bsc", "solana")
@@ -105,21 +235,54 @@ class CryptoPaymentsService:
         Raises:
             Exception: If wallet creation or storage fails
         """
-        # Step 1: Try to get from repository
-        existing_wallet = self.wallet_repository.get_wallet_for_user(user_id, network)
-        if existing_wallet:
-            return existing_wallet
+        return self.wallet_repository.get_or_create_wallet(
+            user_id, network, functools.partial(self._generate_wallet, user_id, network)
+        )
+
+    def _provision_wallet(self, user_id: int, network: str) -> None:
+        """Make sure the user has a wallet, synchronously or in background per `auto_provision_wallet`."""
+        if self._provisioning_executor is None:
+            self.get_wallet_for_user(user_id, network)
+        else:
+            future = self._provisioning_executor.submit(self.get_wallet_for_user, user_id, network)
+            future.add_done_callback(functools.partial(self._log_provisioning_failure, user_id, network))
+
+    @staticmethod
+    def _log_provisioning_failure(user_id: int, network: str, future: Future) -> None:
+        """Log the error of a background wallet provisioning, so a missing wallet can be traced."""
+        if future.cancelled() or future.exception() is None:
+            return
+        logger.error(
+            "Provisioning wallet for user %s on network %s failed",
+            user_id, network, exc_info=future.exception()
+        )
+
+    def close(self) -> None:
+        """
+        Release resources held by the service.
+
+        Waits for background wallet provisioning to finish and stops its threads,
+        then zeroes cached private keys. The service must not create invoices after
+        it is closed.
+        """
+        if self._provisioning_executor is not None:
+            self._provisioning_executor.shutdown(wait=True)
+        self.clear_private_key_cache()
 
-        # Step 2: Generate wallet with help of NetworkClient
+    def __del__(self) -> None:
+        # Zero cached private keys even if the service was never closed
+        if hasattr(self, "_private_key_lock"):
+            self.clear_private_key_cache()
+
+    def _generate_wallet(self, user_id: int, network: str) -> Wallet:
+        """Generate a wallet with NetworkClient and encrypt its private key with SecurityProvider."""
         wallet_credentials = self.network_client.generate_wallet()
 
-        # Step 3: Encrypt private_key with SecurityProvider
         private_key_encrypted = self.security_provider.encrypt_bytes(
             wallet_credentials.private_key
         )
 
-        # Step 4: Save it to repository
-        wallet = Wallet(
+        return Wallet(
             id=0,  # Will be set by repository
             user_id=user_id,
             network=network,
@@ -127,7 +290,27 @@ class CryptoPaymentsService:
             private_key_encrypted=private_key_encrypted
         )
 
-        return self.wallet_repository.save_wallet(wallet)
+    def _generate_wallets(self, user_ids: list[int], network: str) -> list[Wallet]:
+        """Generate wallets for many users, encrypting all private keys in one SecurityProvider call."""
+        if not user_ids:
+            return []
+
+        credentials = [self.network_client.generate_wallet() for _ in user_ids]
+        private_keys_encrypted = self.security_provider.encrypt_many(
+            [wallet_credentials.private_key for wallet_credentials in credentials]
+        )
+
+        return [
+            Wallet(
+                id=0,  # Will be set by repository
+                user_id=user_id,
+                network=network,
+                address=wallet_credentials.address,
+                private_key_encrypted=private_key_encrypted
+            )
+            for user_id, wallet_credentials, private_key_encrypted
+            in zip(user_ids, credentials, private_keys_encrypted)
+        ]
 
     def create_fiat_invoice(
         self,
@@ -142,7 +325,7 @@ class CryptoPaymentsService:
 
         **Use Case Flow:**
         1. Get exchange rate
-        2. Get wallet for user
+        2. Get wallet for user (in background if `auto_provision_wallet` is False)
         3. Create and save invoice
 
         Args:
@@ -157,22 +340,19 @@ class CryptoPaymentsService:
 
         Raises:
             Exception: If invoice creation fails
+            ExchangeRateUnavailable: If exchange rate is not available
         """
         # Step 1: Get exchange rate
-        exchange_rate_data = self.exchange_rate_provider.get_exchange_rate(
-            fiat_currency, self.network_client.get_network_name()
-        )
-        if not exchange_rate_data:
-            raise Exception(f"Exchange rate not available for {fiat_currency}/{self.network_client.get_network_name()}")
+        exchange_rate_data = self._get_exchange_rate(fiat_currency)
 
         # Calculate crypto amount from fiat amount
-        crypto_amount = fiat_amount * exchange_rate_data.reverted_rate
+        crypto_amount = self._convert_fiat_amount(fiat_amount, exchange_rate_data)
 
         # Step 2: Get wallet for user
-        wallet = self.get_wallet_for_user(user_id, network)
+        self._provision_wallet(user_id, network)
 
         # Step 3: Create and save invoice
-        current_time = int(time.time())
+        current_time = _now()
         invoice = Invoice(
             id=0,  # Will be set by repository
             user_id=user_id,
@@ -183,12 +363,139 @@ class CryptoPaymentsService:
             fiat_amount=fiat_amount,
             fiat_currency=fiat_currency,
             crypto_amount=crypto_amount,
-            crypto_currency=self.network_client.get_network_name(),
+            crypto_currency=self._network_name,
             network=network
         )
 
         return self.invoice_repository.save_invoice(invoice)
 
+    def create_fiat_invoices(self, requests: list[FiatInvoiceRequest]) -> list[Invoice]:
+        """
+        Create many fiat invoices (requests) with bulk operations.
+
+        **Use Case Flow:**
+        1. Get exchange rate once per fiat currency
+        2. Get wallets for all users by one atomic bulk get-or-create call per network,
+           generating missing ones in bulk
+        3. Create invoices and save them in bulk
+
+        Args:
+            requests: The invoices to create
+
+        Returns:
+            Created Invoice instances in the order of requests
+
+        Raises:
+            Exception: If invoice creation fails
+            ExchangeRateUnavailable: If exchange rate is not available
+        """
+        # Step 1: Get exchange rate once per fiat currency
+        exchange_rates = {
+            fiat_currency: self._get_exchange_rate(fiat_currency)
+            for fiat_currency in {request.fiat_currency for request in requests}
+        }
+
+        # Step 2: Get wallets for all users in bulk
+        user_ids_by_network: dict[str, set[int]] = {}
+        for request in requests:
+            user_ids_by_network.setdefault(request.network, set()).add(request.user_id)
+        for network, user_ids in user_ids_by_network.items():
+            self.wallet_repository.get_or_create_wallets(
+                list(user_ids), network, functools.partial(self._generate_wallets, network=network)
+            )
+
+        # Step 3: Create invoices and save them in bulk
+        current_time = _now()
+        invoices = [
+            Invoice(
+                id=0,  # Will be set by repository
+                user_id=request.user_id,
+                created_at=current_time,
+                updated_at=current_time,
+                expires_at=request.expires_at,
+                status=InvoiceStatus.PENDING,
+                fiat_amount=request.fiat_amount,
+                fiat_currency=request.fiat_currency,
+                crypto_amount=self._convert_fiat_amount(
+                    request.fiat_amount, exchange_rates[request.fiat_currency]
+                ),
+                crypto_currency=self._network_name,
+                network=request.network
+            )
+            for request in requests
+        ]
+
+        return self.invoice_repository.save_invoices(invoices)
+
+    def warm_rates(self, fiat_currencies: list[str]) -> list[ExchangeRate]:
+        """
+        Warm up exchange rates (fiat_currencies) used by fiat invoices, e.g. at startup.
+
+        **Use Case Flow:**
+        1. Get exchange rates of all fiat currencies by one provider call
+        2. Save them to repository in bulk
+        3. Put them into the in-process rate cache
+
+        Args:
+            fiat_currencies: The fiat currency codes (e.g., ["USD", "EUR"])
+
+        Returns:
+            Fetched ExchangeRate instances
+
+        Raises:
+            Exception: If rate retrieval or storage fails
+        """
+        # Step 1: Get exchange rates of all fiat currencies by one provider call
+        exchange_rates = self.exchange_rate_provider.get_exchange_rates(
+            [(fiat_currency, self._network_name) for fiat_currency in fiat_currencies]
+        )
+
+        # Step 2: Save them to repository in bulk
+        self.exchange_rate_repository.save_exchange_rates(exchange_rates)
+
+        # Step 3: Put them into the in-process rate cache
+        expires_at = time.monotonic() + self.rate_ttl_s
+        for exchange_rate in exchange_rates:
+            key = (exchange_rate.fiat_currency, exchange_rate.crypto_currency)
+            self._rate_cache[key] = (exchange_rate, expires_at)
+
+        return exchange_rates
+
+    def _get_exchange_rate(self, fiat_currency: str) -> ExchangeRate:
+        """
+        Get exchange rate of a fiat currency to the network's cryptocurrency.
+
+        Rates younger than `rate_ttl_s` are served from the in-process cache or the
+        exchange rate repository; otherwise the provider is asked and the fresh rate
+        is saved to both.
+        """
+        key = (fiat_currency.upper(), self._network_name.upper())
+
+        cached = self._rate_cache.get(key)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+
+        stored_rate = self.exchange_rate_repository.get_exchange_rate(*key)
+        if stored_rate:
+            age = _now() - stored_rate.last_updated_at
+            if age < self.rate_ttl_s:
+                self._rate_cache[key] = (stored_rate, time.monotonic() + self.rate_ttl_s - age)
+                return stored_rate
+
+        exchange_rate_data = self.exchange_rate_provider.get_exchange_rate(
+            fiat_currency, self._network_name
+        )
+        if not exchange_rate_data:
+            raise ExchangeRateUnavailable(fiat_currency, self._network_name)
+
+        self.exchange_rate_repository.save_exchange_rate(exchange_rate_data)
+        self._rate_cache[key] = (exchange_rate_data, time.monotonic() + self.rate_ttl_s)
+        return exchange_rate_data
+
+    def _convert_fiat_amount(self, fiat_amount: Decimal, exchange_rate: ExchangeRate) -> Decimal:
+        """Calculate crypto amount from fiat amount."""
+        return fiat_amount * exchange_rate.reverted_rate
+
     def create_crypto_invoice(
         self,
         user_id: int,
@@ -202,7 +509,7 @@ class CryptoPaymentsService:
         Create crypto invoice (user_id, network, crypto_amount, crypto_currency, crypto_currency_address[Optional], expires_at[Optional]).
 
         **Use Case Flow:**
-        1. Get wallet for user
+        1. Get wallet for user (in background if `auto_provision_wallet` is False)
         2. Create and save invoice
 
         Args:
@@ -220,10 +527,10 @@ class CryptoPaymentsService:
             Exception: If invoice creation fails
         """
         # Step 1: Get wallet for user
-        wallet = self.get_wallet_for_user(user_id, network)
+        self._provision_wallet(user_id, network)
 
         # Step 2: Create and save invoice
-        current_time = int(time.time())
+        current_time = _now()
         invoice = Invoice(
             id=0,  # Will be set by repository
             user_id=user_id,
@@ -244,13 +551,18 @@ class CryptoPaymentsService:
         Check invoice status (invoice_id).
 
         **Use Case Flow:**
-        1. Get invoice from repository
+        1. Get invoice together with its wallet from repository in one call (invoices
+           already seen in a final status are returned from memory without any I/O)
         2. Check "status is PENDING" (if not it is final step)
-        3. Get transaction by blockchain reader (if we can't get it, check expired and it is final step)
+        3. Get transaction by blockchain reader (if we can't get it, check expired and it is final step);
+           the lookup is skipped while the invoice is backing off and no block arrived since
+           its last lookup (the chain tip is only asked for inside the back-off window)
         4. Check if such transaction already in repository (if same transaction was already saved, check expired and it is final step)
         5. Save transaction to repository
         6. Update invoice status
 
+        Steps 4-6 run as one atomic `InvoiceRepository.finalize_payment` call.
+
         Args:
             invoice_id: The invoice identifier
 
@@ -259,60 +571,426 @@ class CryptoPaymentsService:
 
         Raises:
             Exception: If status check fails
+            InvoiceNotFound: If invoice not found
+            WalletNotFound: If invoice owner has no wallet on the network
         """
         # Step 1: Get invoice from repository
-        invoice = self.invoice_repository.get_invoice_by_id(invoice_id)
-        if not invoice:
-            raise Exception(f"Invoice with ID {invoice_id} not found")
+        terminal_invoice = self._get_terminal_invoice(invoice_id)
+        if terminal_invoice:
+            return terminal_invoice
+
+        invoice_with_wallet = self.invoice_repository.get_invoice_with_wallet(invoice_id)
+        if not invoice_with_wallet:
+            raise InvoiceNotFound(invoice_id)
+
+        invoice, wallet = invoice_with_wallet
+        return self._remember_if_terminal(self._check_invoice(invoice, _now(), wallet))
 
+    def _check_invoice(self, invoice: Invoice, current_time: int, wallet: Optional[Wallet] = None) -> Invoice:
+        """
+        Run steps 2-6 of `check_invoice_status` for an already loaded invoice.
+
+        The wallet is looked up in the wallet repository if it was not loaded with the invoice.
+        """
         # Step 2: Check "status is PENDING" (if not it is final step)
         if invoice.status != InvoiceStatus.PENDING:
             return invoice
 
         # Check if invoice has expired
-        current_time = int(time.time())
-        if invoice.expires_at and current_time > invoice.expires_at:
-            invoice.status = InvoiceStatus.EXPIRED
-            return self.invoice_repository.update_invoice_status(invoice_id, InvoiceStatus.EXPIRED)
+        expired_invoice = self._expire_if_needed(invoice, current_time)
+        if expired_invoice:
+            return expired_invoice
+
+        # Skip the lookup while nothing could have changed on chain
+        if self._is_backing_off(invoice, current_time):
+            current_block = self.blockchain_reader.get_current_block(invoice.network)
+            if not self._has_new_blocks(invoice, current_block):
+                return invoice
+        searched_block = self._last_seen_block.get(invoice.network)
 
         # Step 3: Get transaction by blockchain reader
-        wallet = self.wallet_repository.get_wallet_for_user(invoice.user_id, invoice.network)
+        if not wallet:
+            wallet = self.wallet_repository.get_wallet_for_user(invoice.user_id, invoice.network)
 
         if not wallet:
-            raise Exception(f"Wallet not found for user {invoice.user_id} and network {invoice.network}")
+            raise WalletNotFound(invoice.user_id, invoice.network)
 
         transaction = self.blockchain_reader.search_transactions_for_wallet(wallet, invoice)
 
-        # If we can't get transaction, check expired and it is final step
-        if not transaction:
-            if invoice.expires_at and current_time > invoice.expires_at:
-                invoice.status = InvoiceStatus.EXPIRED
-                return self.invoice_repository.update_invoice_status(invoice_id, InvoiceStatus.EXPIRED)
-            return invoice
+        invoice = self._process_transaction(invoice, transaction, current_time)
+        self._schedule_next_check(invoice, searched_block, current_time, transaction is not None)
+        return invoice
+
+    async def check_invoice_status_async(self, invoice_id: int) -> Invoice:
+        """
+        Check invoice status (invoice_id) without blocking the event loop.
+
+        Same flow as `check_invoice_status`, but every blockchain reader and repository
+        call is awaited directly if it is a coroutine function (e.g. on an asyncpg pool),
+        or run in a worker thread otherwise, so concurrent checks never block the event loop.
+
+        Args:
+            invoice_id: The invoice identifier
+
+        Returns:
+            Updated Invoice instance
+
+        Raises:
+            Exception: If status check fails
+            InvoiceNotFound: If invoice not found
+            WalletNotFound: If invoice owner has no wallet on the network
+        """
+        terminal_invoice = self._get_terminal_invoice(invoice_id)
+        if terminal_invoice:
+            return terminal_invoice
+
+        invoice_with_wallet = await self._call(self.invoice_repository.get_invoice_with_wallet, invoice_id)
+        if not invoice_with_wallet:
+            raise InvoiceNotFound(invoice_id)
+
+        invoice, wallet = invoice_with_wallet
+        return self._remember_if_terminal(await self._check_invoice_async(invoice, _now(), wallet))
+
+    async def check_invoices_status(self, invoice_ids: list[int]) -> list[Invoice | Exception]:
+        """
+        Check status of many invoices (invoice_ids) concurrently.
 
-        # Step 4: Check if such transaction already in repository
-        existing_transaction = self.transaction_repository.get_transaction_by_hash_and_network(
-            transaction.hash, transaction.network
+        **Use Case Flow:**
+        1. Get all invoices from repository in one bulk call (skipping invoices
+           already seen in a final status)
+        2. Get wallets of all PENDING invoice owners in one bulk call per network
+        3. Run blockchain reader lookups for PENDING invoices concurrently
+        4. Finish every invoice as in `check_invoice_status`
+
+        Repository and blockchain reader calls run as in `check_invoice_status_async`,
+        so the per-invoice queries of step 4 overlap instead of blocking the event loop.
+        A failing invoice does not abort the others: its exception is returned in its place.
+        An invoice requested more than once is checked once and reported at every position.
+
+        Args:
+            invoice_ids: The invoice identifiers
+
+        Returns:
+            For each of invoice_ids in order, the updated Invoice instance or the exception
+            raised while checking it (e.g. InvoiceNotFound, WalletNotFound)
+        """
+        # Step 1: Get all invoices from repository in one bulk call
+        unique_invoice_ids = list(dict.fromkeys(invoice_ids))
+        checked_invoices: dict[int, Invoice | Exception] = {}
+        for invoice_id in unique_invoice_ids:
+            terminal_invoice = self._get_terminal_invoice(invoice_id)
+            if terminal_invoice:
+                checked_invoices[invoice_id] = terminal_invoice
+        invoices = await self._call(
+            self.invoice_repository.get_invoices_by_ids,
+            [invoice_id for invoice_id in unique_invoice_ids if invoice_id not in checked_invoices]
         )
-        if existing_transaction:
-            # If same transaction was already saved, check expired and it is final step
-            if invoice.expires_at and current_time > invoice.expires_at:
-                invoice.status = InvoiceStatus.EXPIRED
-                return self.invoice_repository.update_invoice_status(invoice_id, InvoiceStatus.EXPIRED)
+
+        # Step 2: Get wallets of all PENDING invoice owners in one bulk call per network
+        user_ids_by_network: dict[str, set[int]] = {}
+        for invoice in invoices:
+            if invoice.status == InvoiceStatus.PENDING:
+                user_ids_by_network.setdefault(invoice.network, set()).add(invoice.user_id)
+        wallets_by_network = await asyncio.gather(*(
+            self._call(self.wallet_repository.get_wallets_for_users, list(user_ids), network)
+            for network, user_ids in user_ids_by_network.items()
+        ))
+        wallets = {
+            (wallet.user_id, wallet.network): wallet
+            for network_wallets in wallets_by_network
+            for wallet in network_wallets
+        }
+
+        # Step 3-4: Check invoices concurrently with one shared timestamp
+        current_time = _now()
+        results = await asyncio.gather(
+            *(
+                self._check_invoice_async(invoice, current_time, wallets.get((invoice.user_id, invoice.network)))
+                for invoice in invoices
+            ),
+            return_exceptions=True
+        )
+        for invoice, result in zip(invoices, results):
+            if isinstance(result, Exception):
+                checked_invoices[invoice.id] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                checked_invoices[invoice.id] = self._remember_if_terminal(result)
+
+        return [
+            checked_invoices[invoice_id] if invoice_id in checked_invoices else InvoiceNotFound(invoice_id)
+            for invoice_id in invoice_ids
+        ]
+
+    async def _check_invoice_async(
+        self, invoice: Invoice, current_time: int, wallet: Optional[Wallet] = None
+    ) -> Invoice:
+        """
+        Run steps 2-6 of `check_invoice_status` for an already loaded invoice.
+
+        The wallet is looked up in the wallet repository if it was not loaded with the invoice.
+        """
+        if invoice.status != InvoiceStatus.PENDING:
             return invoice
 
-        # Step 5: Save transaction to repository
-        self.transaction_repository.save_transaction(transaction)
+        expired_invoice = await self._expire_if_needed_async(invoice, current_time)
+        if expired_invoice:
+            return expired_invoice
+
+        if self._is_backing_off(invoice, current_time):
+            current_block = await self._call(self.blockchain_reader.get_current_block, invoice.network)
+            if not self._has_new_blocks(invoice, current_block):
+                return invoice
+        searched_block = self._last_seen_block.get(invoice.network)
+
+        if not wallet:
+            wallet = await self._call(
+                self.wallet_repository.get_wallet_for_user, invoice.user_id, invoice.network
+            )
+
+        if not wallet:
+            raise WalletNotFound(invoice.user_id, invoice.network)
+
+        transaction = await self._call(
+            self.blockchain_reader.search_transactions_for_wallet, wallet, invoice
+        )
+        invoice = await self._process_transaction_async(invoice, transaction, current_time)
+        self._schedule_next_check(invoice, searched_block, current_time, transaction is not None)
+        return invoice
+
+    def forget_invoice(self, invoice_id: int) -> None:
+        """
+        Drop an invoice from the in-memory cache of invoices in a final status.
+
+        Call it after the invoice was deleted or its status changed other than through
+        this service, so the next status check reads it from the repository again.
+
+        Args:
+            invoice_id: The invoice identifier
+        """
+        with self._terminal_lock:
+            self._terminal_invoices.pop(invoice_id, None)
+
+    def _get_terminal_invoice(self, invoice_id: int) -> Optional[Invoice]:
+        """Get a copy of an invoice in a final status from memory, or None if it is not cached."""
+        with self._terminal_lock:
+            invoice = self._terminal_invoices.get(invoice_id)
+        return invoice.model_copy() if invoice else None
+
+    def _remember_if_terminal(self, invoice: Invoice) -> Invoice:
+        """Keep a copy of an invoice in a final status in memory, so repeat status checks skip all I/O."""
+        if invoice.status == InvoiceStatus.PENDING or self.terminal_invoice_cache_size <= 0:
+            return invoice
 
-        # Step 6: Update invoice status
-        invoice.status = InvoiceStatus.PAID
-        self.invoice_repository.update_invoice_status(invoice_id, InvoiceStatus.PAID)
+        with self._terminal_lock:
+            self._terminal_invoices[invoice.id] = invoice.model_copy()
+            while len(self._terminal_invoices) > self.terminal_invoice_cache_size:
+                self._terminal_invoices.popitem(last=False)
         return invoice
 
+    def _expire_if_needed(self, invoice: Invoice, current_time: int) -> Optional[Invoice]:
+        """Mark the invoice EXPIRED if its expiration time has passed and it is still PENDING.
+
+        Returns:
+            The updated invoice if it has expired (the stored invoice if it left PENDING
+            in the meantime, e.g. was paid concurrently), None otherwise
+        """
+        if not invoice.expires_at or current_time <= invoice.expires_at:
+            return None
+
+        self._clear_backoff(invoice.id)
+        expired_invoices = self.invoice_repository.update_pending_invoice_statuses(
+            [invoice.id], InvoiceStatus.EXPIRED
+        )
+        if expired_invoices:
+            return expired_invoices[0]
+
+        current_invoice = self.invoice_repository.get_invoice_by_id(invoice.id)
+        if not current_invoice:
+            raise InvoiceNotFound(invoice.id)
+        return current_invoice
+
+    async def _expire_if_needed_async(self, invoice: Invoice, current_time: int) -> Optional[Invoice]:
+        """Async variant of `_expire_if_needed` running repository calls through `_call`."""
+        if not invoice.expires_at or current_time <= invoice.expires_at:
+            return None
+
+        self._clear_backoff(invoice.id)
+        expired_invoices = await self._call(
+            self.invoice_repository.update_pending_invoice_statuses, [invoice.id], InvoiceStatus.EXPIRED
+        )
+        if expired_invoices:
+            return expired_invoices[0]
+
+        current_invoice = await self._call(self.invoice_repository.get_invoice_by_id, invoice.id)
+        if not current_invoice:
+            raise InvoiceNotFound(invoice.id)
+        return current_invoice
+
+    def _is_backing_off(self, invoice: Invoice, current_time: int) -> bool:
+        """Whether the invoice's next check is not due yet."""
+        return current_time < self._next_check_at.get(invoice.id, 0)
+
+    def _has_new_blocks(self, invoice: Invoice, current_block: Optional[int]) -> bool:
+        """Remember the network's chain tip and tell whether it moved since the invoice's last lookup."""
+        if current_block is None:
+            return True
+        with self._network_lock(invoice.network):
+            self._last_seen_block[invoice.network] = current_block
+            return self._last_searched_block.get(invoice.id) != current_block
+
+    def _schedule_next_check(
+        self,
+        invoice: Invoice,
+        searched_block: Optional[int],
+        current_time: int,
+        transaction_found: bool
+    ) -> None:
+        """
+        Remember the chain tip the lookup covered and double the invoice's back-off on a miss,
+        reset it on a hit.
+
+        `searched_block` is the latest tip known before the lookup (None if none is known yet),
+        so it never claims more blocks than the lookup actually saw.
+        """
+        with self._network_lock(invoice.network):
+            if transaction_found or invoice.status != InvoiceStatus.PENDING:
+                self._clear_backoff(invoice.id)
+                return
+            self._last_searched_block[invoice.id] = searched_block
+            previous_backoff = self._check_backoff.get(invoice.id)
+            backoff = min(previous_backoff * 2, MAX_CHECK_BACKOFF) if previous_backoff else MIN_CHECK_BACKOFF
+            self._check_backoff[invoice.id] = backoff
+            self._next_check_at[invoice.id] = current_time + backoff
+
+    def _clear_backoff(self, invoice_id: int) -> None:
+        """Drop adaptive polling state of an invoice that is no longer PENDING."""
+        self._next_check_at.pop(invoice_id, None)
+        self._check_backoff.pop(invoice_id, None)
+        self._last_searched_block.pop(invoice_id, None)
+
+    def _network_lock(self, network: str) -> threading.Lock:
+        """Get the lock guarding adaptive polling state of a network."""
+        return self._network_locks.setdefault(network, threading.Lock())
+
+    def _process_transaction(
+        self,
+        invoice: Invoice,
+        transaction: Optional[Transaction],
+        current_time: int
+    ) -> Invoice:
+        """Run steps 4-6 of `check_invoice_status` for the found transaction."""
+        # If we can't get transaction, check expired and it is final step
+        if not transaction:
+            return self._expire_if_needed(invoice, current_time) or invoice
+
+        # Step 4-6: Save transaction and update invoice status unless it was already saved
+        paid_invoice = self.invoice_repository.finalize_payment(invoice.id, transaction)
+        if paid_invoice:
+            return paid_invoice
+
+        # If same transaction was already saved, check expired and it is final step
+        return self._expire_if_needed(invoice, current_time) or invoice
+
+    async def _process_transaction_async(
+        self,
+        invoice: Invoice,
+        transaction: Optional[Transaction],
+        current_time: int
+    ) -> Invoice:
+        """Async variant of `_process_transaction` running repository calls through `_call`."""
+        if not transaction:
+            return await self._expire_if_needed_async(invoice, current_time) or invoice
+
+        paid_invoice = await self._call(self.invoice_repository.finalize_payment, invoice.id, transaction)
+        if paid_invoice:
+            return paid_invoice
+
+        return await self._expire_if_needed_async(invoice, current_time) or invoice
+
+    def check_pending_invoices(self, network: str) -> list[Invoice]:
+        """
+        Check status of all PENDING invoices on a network (network) with bulk operations.
+
+        **Use Case Flow:**
+        1. Get PENDING invoices of the network from repository (expired ones still PENDING
+           are marked EXPIRED, so a concurrently paid invoice keeps its PAID status)
+        2. Get wallets for all invoice owners in one bulk call
+        3. Get transactions for all invoices by one batched blockchain reader call
+        4. Save new transactions and mark their invoices PAID by one
+           `InvoiceRepository.finalize_payments` call
+
+        Step 4 gives every invoice the guarantee of `check_invoice_status`: a transaction
+        already recorded for another invoice never pays a second one.
+        Invoices whose owner has no wallet on the network are left PENDING.
+
+        Args:
+            network: The blockchain network
+
+        Returns:
+            List of invoices whose status was changed
+
+        Raises:
+            Exception: If status check fails
+        """
+        current_time = _now()
+
+        # Step 1: Get PENDING invoices of the network from repository
+        expired_invoice_ids = []
+        pending_invoices = []
+        for invoice in self.invoice_repository.get_invoices_by_status_and_network(
+            InvoiceStatus.PENDING, network
+        ):
+            if invoice.expires_at and current_time > invoice.expires_at:
+                expired_invoice_ids.append(invoice.id)
+            else:
+                pending_invoices.append(invoice)
+
+        updated_invoices = []
+        if expired_invoice_ids:
+            for invoice_id in expired_invoice_ids:
+                self._clear_backoff(invoice_id)
+            updated_invoices.extend(map(
+                self._remember_if_terminal,
+                self.invoice_repository.update_pending_invoice_statuses(
+                    expired_invoice_ids, InvoiceStatus.EXPIRED
+                )
+            ))
+        if not pending_invoices:
+            return updated_invoices
+
+        # Step 2: Get wallets for all invoice owners in one bulk call
+        user_ids = list({invoice.user_id for invoice in pending_invoices})
+        wallets = {
+            wallet.user_id: wallet
+            for wallet in self.wallet_repository.get_wallets_for_users(user_ids, network)
+        }
+
+        # Step 3: Get transactions for all invoices by one batched blockchain reader call
+        wallets_with_invoices = [
+            (wallets[invoice.user_id], invoice)
+            for invoice in pending_invoices
+            if invoice.user_id in wallets
+        ]
+        if not wallets_with_invoices:
+            return updated_invoices
+        transactions = self.blockchain_reader.search_transactions_for_wallets(wallets_with_invoices)
+        if not transactions:
+            return updated_invoices
+
+        # Step 4: Save new transactions and mark their invoices PAID
+        for invoice in self.invoice_repository.finalize_payments(transactions):
+            self._clear_backoff(invoice.id)
+            updated_invoices.append(self._remember_if_terminal(invoice))
+        return updated_invoices
+
     def get_invoice_status(self, invoice_id: int) -> InvoiceStatus:
         """
         Get the current status of an invoice.
 
+        Invoices already seen in a final status are answered from memory (see `forget_invoice`).
+
         Args:
             invoice_id: The invoice identifier
 
@@ -320,15 +998,19 @@ class CryptoPaymentsService:
             Current InvoiceStatus
 
         Raises:
-            Exception: If invoice not found
+            InvoiceNotFound: If invoice not found
         """
+        terminal_invoice = self._get_terminal_invoice(invoice_id)
+        if terminal_invoice:
+            return terminal_invoice.status
+
         invoice = self.invoice_repository.get_invoice_by_id(invoice_id)
         if not invoice:
-            raise Exception(f"Invoice with ID {invoice_id} not found")
+            raise InvoiceNotFound(invoice_id)
 
         return invoice.status
 
-    def get_user_invoices(self, user_id: int) -> list[Invoice]:
+    def get_user_invoices(self, user_id: int) -> Iterator[Invoice]:
         """
         Get all invoices for a specific user.
 
@@ -336,10 +1018,29 @@ class CryptoPaymentsService:
             user_id: The user identifier
 
         Returns:
-            List of Invoice instances for the user
+            Iterator over Invoice instances for the user (streamed by the repository)
         """
         return self.invoice_repository.get_invoices_by_user(user_id)
 
+    def get_user_invoices_page(
+        self,
+        user_id: int,
+        limit: int,
+        after_id: Optional[int] = None
+    ) -> list[Invoice]:
+        """
+        Get one page of invoices for a specific user, ordered by ID.
+
+        Args:
+            user_id: The user identifier
+            limit: Maximum number of invoices to return
+            after_id: ID of the last invoice of the previous page (None for the first page)
+
+        Returns:
+            List of at most `limit` Invoice instances for the user
+        """
+        return self.invoice_repository.get_invoices_by_user_page(user_id, limit, after_id)
+
     def transfer_from_wallet(
         self,
         user_id: int,
@@ -368,13 +1069,59 @@ class CryptoPaymentsService:
         wallet = self.get_wallet_for_user(user_id, network)
 
         # Decrypt private key
-        private_key_bytes = self.security_provider.decrypt_bytes(wallet.private_key_encrypted)
-        private_key = private_key_bytes.decode('utf-8')
-
-        # Perform transfer
-        return self.network_client.transfer_amount(
-            private_key=private_key,
-            to_address=to_address,
-            amount=amount,
-            **kwargs
-        )
+        private_key = self._decrypt_private_key(wallet)
+
+        # Perform transfer, zeroing the decrypted key afterwards
+        try:
+            return self.network_client.transfer_amount(
+                private_key=private_key,
+                to_address=to_address,
+                amount=amount,
+                **kwargs
+            )
+        finally:
+            _zero(private_key)
+
+    def clear_private_key_cache(self) -> None:
+        """Zero and drop all cached decrypted private keys."""
+        with self._private_key_lock:
+            while self._private_key_cache:
+                _, private_key = self._private_key_cache.popitem()
+                _zero(private_key)
+
+    def _decrypt_private_key(self, wallet: Wallet) -> bytearray:
+        """
+        Decrypt the wallet's private key into a buffer owned by the caller, who zeroes it after use.
+
+        Cache hits copy the cached key, so no immutable copy of it is left behind. On a miss the
+        bytes returned by the security provider cannot be zeroed; they are dropped right away.
+        """
+        key = (wallet.id, wallet.private_key_encrypted)
+        if self.private_key_cache_size > 0:
+            with self._private_key_lock:
+                cached = self._private_key_cache.get(key)
+                if cached is not None:
+                    self._private_key_cache.move_to_end(key)
+                    return bytearray(cached)
+
+        private_key = bytearray(self.security_provider.decrypt_bytes(wallet.private_key_encrypted))
+        if self.private_key_cache_size <= 0:
+            return private_key
+
+        with self._private_key_lock:
+            # A concurrent transfer may have cached the same key meanwhile; keep its copy
+            if key in self._private_key_cache:
+                self._private_key_cache.move_to_end(key)
+                return private_key
+            self._private_key_cache[key] = bytearray(private_key)
+            while len(self._private_key_cache) > self.private_key_cache_size:
+                _, evicted = self._private_key_cache.popitem(last=False)
+                _zero(evicted)
+        return private_key
+
+    @staticmethod
+    async def _call(func: Callable[..., Any], *args: Any) -> Any:
+        """Await `func` if it is a coroutine function, otherwise run it in a worker thread."""
+        if inspect.iscoroutinefunction(func):
+            return await func(*args)
+        return await asyncio.to_thread(func, *args)
@@ -38,6 +38,14 @@ def test_save_and_get_exchange_rate(exchange_rate_repository: InMemoryExchangeRa
     assert retrieved_rate == sample_exchange_rate
 
 
+def test_save_exchange_rates(exchange_rate_repository: InMemoryExchangeRateRepository, sample_exchange_rate: ExchangeRate):
+    """Test saving many exchange rates at once."""
+    other_rate = sample_exchange_rate.model_copy(update={"id": 2, "fiat_currency": "EUR"})
+    saved_rates = exchange_rate_repository.save_exchange_rates([sample_exchange_rate, other_rate])
+    assert saved_rates == [sample_exchange_rate, other_rate]
+    assert exchange_rate_repository.get_exchange_rate("EUR", "BTC") == other_rate
+
+
 def test_get_exchange_rate_not_found(exchange_rate_repository: InMemoryExchangeRateRepository):
     """Test retrieving a non-existent exchange rate."""
     retrieved_rate = exchange_rate_repository.get_exchange_rate("USD", "ETH")
@@ -7,14 +7,15 @@ from decimal import Decimal
 from time import time
 
 from cryptopay.enums import InvoiceStatus
-from cryptopay.models import Invoice
-from cryptopay.repositories import InMemoryInvoiceRepository
+from cryptopay.interfaces import InvoiceRepository
+from cryptopay.models import Invoice, Transaction, Wallet
+from cryptopay.repositories import InMemoryInvoiceRepository, InMemoryTransactionRepository
 
 
 @pytest.fixture
 def invoice_repository() -> InMemoryInvoiceRepository:
     """Fixture to provide an InMemoryInvoiceRepository instance."""
-    return InMemoryInvoiceRepository()
+    return InMemoryInvoiceRepository(InMemoryTransactionRepository())
 
 
 @pytest.fixture
@@ -37,24 +38,62 @@ def test_save_and_get_invoice(invoice_repository: InMemoryInvoiceRepository, sam
     assert retrieved_invoice == sample_invoice
 
 
+def test_save_invoices(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
+    """Test saving many invoices at once."""
+    other_invoice = sample_invoice.model_copy(update={"id": 2, "user_id": 2})
+    saved_invoices = invoice_repository.save_invoices([sample_invoice, other_invoice])
+    assert len(saved_invoices) == 2
+    assert invoice_repository.get_invoice_by_id(saved_invoices[1].id) == other_invoice
+
+
 def test_get_invoice_not_found(invoice_repository: InMemoryInvoiceRepository):
     """Test retrieving a non-existent invoice."""
     retrieved_invoice = invoice_repository.get_invoice_by_id(999)
     assert retrieved_invoice is None
 
 
+def test_get_invoices_by_ids(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
+    """Test retrieving invoices by a list of IDs, skipping missing ones."""
+    invoice_repository.save_invoice(sample_invoice)
+    invoices = invoice_repository.get_invoices_by_ids([sample_invoice.id, 999])
+    assert invoices == [sample_invoice]
+
+
 def test_get_invoices_by_user(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
     """Test retrieving invoices by user ID."""
     invoice_repository.save_invoice(sample_invoice)
-    invoices = invoice_repository.get_invoices_by_user(1)
+    invoices = list(invoice_repository.get_invoices_by_user(1))
     assert len(invoices) == 1
     assert invoices[0] == sample_invoice
 
 
+def test_get_invoices_by_user_while_deleting(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
+    """Test that invoices deleted while iterating over a user's invoices are skipped."""
+    invoice_repository.save_invoices([
+        sample_invoice.model_copy(update={"id": invoice_id}) for invoice_id in (1, 2, 3)
+    ])
+    invoices = invoice_repository.get_invoices_by_user(1)
+    assert next(invoices).id == 1
+
+    invoice_repository.delete_invoice(2)
+    assert [invoice.id for invoice in invoices] == [3]
+
+
+def test_get_invoices_by_user_page(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
+    """Test retrieving invoices of a user page by page."""
+    invoice_repository.save_invoices([
+        sample_invoice.model_copy(update={"id": invoice_id}) for invoice_id in (1, 2, 3)
+    ])
+    first_page = invoice_repository.get_invoices_by_user_page(1, limit=2)
+    assert [invoice.id for invoice in first_page] == [1, 2]
+    second_page = invoice_repository.get_invoices_by_user_page(1, limit=2, after_id=first_page[-1].id)
+    assert [invoice.id for invoice in second_page] == [3]
+
+
 def test_get_invoices_by_status(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
     """Test retrieving invoices by status."""
     invoice_repository.save_invoice(sample_invoice)
-    invoices = invoice_repository.get_invoices_by_status(InvoiceStatus.PENDING)
+    invoices = list(invoice_repository.get_invoices_by_status(InvoiceStatus.PENDING))
     assert len(invoices) == 1
     assert invoices[0] == sample_invoice
 
@@ -67,6 +106,134 @@ def test_update_invoice_status(invoice_repository: InMemoryInvoiceRepository, sa
     assert updated_invoice.status == InvoiceStatus.PAID
 
 
+def test_update_invoice_statuses(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
+    """Test updating the status of many invoices at once."""
+    invoice_repository.save_invoice(sample_invoice)
+    updated_invoices = invoice_repository.update_invoice_statuses([sample_invoice.id, 999], InvoiceStatus.EXPIRED)
+    assert updated_invoices == [sample_invoice.model_copy(update={"status": InvoiceStatus.EXPIRED})]
+    assert invoice_repository.get_invoice_by_id(sample_invoice.id).status == InvoiceStatus.EXPIRED
+
+
+@pytest.mark.parametrize("update_pending_invoice_statuses", [
+    InMemoryInvoiceRepository.update_pending_invoice_statuses,
+    InvoiceRepository.update_pending_invoice_statuses,
+])
+def test_update_pending_invoice_statuses(
+    invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice, update_pending_invoice_statuses
+):
+    """Test that a guarded status update skips invoices no longer pending, with and without the override."""
+    paid_invoice = sample_invoice.model_copy(update={"id": 2, "status": InvoiceStatus.PAID})
+    invoice_repository.save_invoices([sample_invoice, paid_invoice])
+
+    updated_invoices = update_pending_invoice_statuses(
+        invoice_repository, [sample_invoice.id, paid_invoice.id, 999], InvoiceStatus.EXPIRED
+    )
+    assert updated_invoices == [sample_invoice.model_copy(update={"status": InvoiceStatus.EXPIRED})]
+    assert invoice_repository.get_invoice_by_id(paid_invoice.id).status == InvoiceStatus.PAID
+
+
+@pytest.mark.parametrize("get_invoices_by_status_and_network", [
+    InMemoryInvoiceRepository.get_invoices_by_status_and_network,
+    InvoiceRepository.get_invoices_by_status_and_network,
+])
+def test_get_invoices_by_status_and_network(
+    invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice, get_invoices_by_status_and_network
+):
+    """Test retrieving invoices by status on one network, with and without the override."""
+    other_invoice = sample_invoice.model_copy(update={"id": 2, "network": "erc20"})
+    invoice_repository.save_invoices([sample_invoice, other_invoice])
+    invoice_repository.update_invoice_status(other_invoice.id, InvoiceStatus.PAID)
+
+    assert list(get_invoices_by_status_and_network(invoice_repository, InvoiceStatus.PENDING, "bitcoin")) == [
+        sample_invoice
+    ]
+    assert list(get_invoices_by_status_and_network(invoice_repository, InvoiceStatus.PENDING, "erc20")) == []
+    assert list(get_invoices_by_status_and_network(invoice_repository, InvoiceStatus.PAID, "erc20")) == [
+        other_invoice.model_copy(update={"status": InvoiceStatus.PAID})
+    ]
+
+
+def test_get_invoices_by_status_after_update(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
+    """Test that status lookups follow status updates and deletions."""
+    invoice_repository.save_invoice(sample_invoice)
+    invoice_repository.update_invoice_status(sample_invoice.id, InvoiceStatus.PAID)
+    assert list(invoice_repository.get_invoices_by_status(InvoiceStatus.PENDING)) == []
+    assert list(invoice_repository.get_invoices_by_status(InvoiceStatus.PAID)) == [
+        sample_invoice.model_copy(update={"status": InvoiceStatus.PAID})
+    ]
+
+    invoice_repository.delete_invoice(sample_invoice.id)
+    assert list(invoice_repository.get_invoices_by_status(InvoiceStatus.PAID)) == []
+    assert list(invoice_repository.get_invoices_by_user(sample_invoice.user_id)) == []
+
+
+def test_get_invoices_by_status_after_in_place_change(
+    invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice
+):
+    """Test that changing a returned invoice in place does not leave status lookups stale."""
+    invoice_repository.save_invoice(sample_invoice)
+    invoice_repository.get_invoice_by_id(sample_invoice.id).status = InvoiceStatus.PAID
+    sample_invoice.status = InvoiceStatus.CANCELLED
+
+    assert list(invoice_repository.get_invoices_by_status(InvoiceStatus.PENDING)) == [
+        sample_invoice.model_copy(update={"status": InvoiceStatus.PENDING})
+    ]
+    assert list(invoice_repository.get_invoices_by_status(InvoiceStatus.PAID)) == []
+
+
+def test_finalize_payment(sample_invoice: Invoice):
+    """Test that a payment is recorded once and marks the invoice as paid."""
+    transaction_repository = InMemoryTransactionRepository()
+    invoice_repository = InMemoryInvoiceRepository(transaction_repository)
+    invoice_repository.save_invoice(sample_invoice)
+    transaction = Transaction(id=1, invoice_id=sample_invoice.id, hash="0x1234567890abcdef", network="bitcoin")
+
+    paid_invoice = invoice_repository.finalize_payment(sample_invoice.id, transaction)
+    assert paid_invoice.status == InvoiceStatus.PAID
+    assert transaction_repository.get_transactions_by_invoice(sample_invoice.id) == [transaction]
+
+    # The same transaction cannot finalize a payment twice
+    invoice_repository.update_invoice_status(sample_invoice.id, InvoiceStatus.PENDING)
+    assert invoice_repository.finalize_payment(sample_invoice.id, transaction) is None
+    assert invoice_repository.get_invoice_by_id(sample_invoice.id).status == InvoiceStatus.PENDING
+
+
+def test_finalize_payments(sample_invoice: Invoice):
+    """Test that one transaction pays only the first of many invoices in a bulk finalization."""
+    transaction_repository = InMemoryTransactionRepository()
+    invoice_repository = InMemoryInvoiceRepository(transaction_repository)
+    other_invoice = sample_invoice.model_copy(update={"id": 2})
+    invoice_repository.save_invoices([sample_invoice, other_invoice])
+
+    paid_invoices = invoice_repository.finalize_payments({
+        invoice.id: Transaction(id=invoice.id, invoice_id=invoice.id, hash="0xdup", network="bitcoin")
+        for invoice in (sample_invoice, other_invoice)
+    })
+    assert [invoice.id for invoice in paid_invoices] == [sample_invoice.id]
+    assert invoice_repository.get_invoice_by_id(other_invoice.id).status == InvoiceStatus.PENDING
+    assert len(transaction_repository.get_transactions_by_hash("0xdup")) == 1
+
+
+def test_get_invoice_with_wallet(sample_invoice: Invoice):
+    """Test retrieving an invoice together with its owner's wallet on the invoice network."""
+    wallet = Wallet(id=1, user_id=1, network="bitcoin", address="bc1qaddress", private_key_encrypted=b"key")
+
+    class StubWalletRepository:
+        def get_wallet_for_user(self, user_id: int, network: str):
+            return wallet if (user_id, network) == (wallet.user_id, wallet.network) else None
+
+    invoice_repository = InMemoryInvoiceRepository(InMemoryTransactionRepository(), StubWalletRepository())
+    invoice_repository.save_invoice(sample_invoice)
+    assert invoice_repository.get_invoice_with_wallet(sample_invoice.id) == (sample_invoice, wallet)
+
+    # A user without a wallet on the network gets no wallet
+    other_invoice = sample_invoice.model_copy(update={"id": 2, "network": "erc20"})
+    invoice_repository.save_invoice(other_invoice)
+    assert invoice_repository.get_invoice_with_wallet(other_invoice.id) == (other_invoice, None)
+
+    assert invoice_repository.get_invoice_with_wallet(999) is None
+
+
 def test_delete_invoice(invoice_repository: InMemoryInvoiceRepository, sample_invoice: Invoice):
     """Test deleting an invoice."""
     invoice_repository.save_invoice(sample_invoice)
@@ -55,6 +55,52 @@ def test_get_transactions_by_invoice(transaction_repository: InMemoryTransaction
     assert transactions[0] == sample_transaction
 
 
+def test_get_transaction_by_hash_and_network_after_update(transaction_repository: InMemoryTransactionRepository, sample_transaction: Transaction):
+    """Test that hash lookups follow transaction updates and deletions."""
+    transaction_repository.save_transaction(sample_transaction)
+    updated_transaction = sample_transaction.model_copy(update={"hash": "0xfedcba"})
+    transaction_repository.update_transaction(updated_transaction)
+    assert transaction_repository.get_transaction_by_hash_and_network(
+        sample_transaction.hash, sample_transaction.network
+    ) is None
+    assert transaction_repository.get_transaction_by_hash_and_network(
+        "0xfedcba", sample_transaction.network
+    ) == updated_transaction
+
+    transaction_repository.delete_transaction(sample_transaction.id)
+    assert transaction_repository.get_transaction_by_hash_and_network("0xfedcba", sample_transaction.network) is None
+    assert transaction_repository.get_transactions_by_invoice(sample_transaction.invoice_id) == []
+
+
+def test_get_transaction_by_hash_and_network_after_in_place_change(
+    transaction_repository: InMemoryTransactionRepository, sample_transaction: Transaction
+):
+    """Test that changing a returned transaction in place does not leave hash lookups stale."""
+    transaction_repository.save_transaction(sample_transaction)
+    transaction_repository.get_transaction_by_id(sample_transaction.id).hash = "0xfedcba"
+
+    assert transaction_repository.get_transaction_by_hash_and_network(
+        sample_transaction.hash, sample_transaction.network
+    ) == sample_transaction
+
+
+def test_get_transaction_by_hash_and_network_with_duplicates(
+    transaction_repository: InMemoryTransactionRepository, sample_transaction: Transaction
+):
+    """Test that a hash lookup returns the first of duplicate transactions and finds it after another is deleted."""
+    duplicate_transaction = sample_transaction.model_copy(update={"id": 2})
+    transaction_repository.save_transaction(sample_transaction)
+    transaction_repository.save_transaction(duplicate_transaction)
+    assert transaction_repository.get_transaction_by_hash_and_network(
+        sample_transaction.hash, sample_transaction.network
+    ) == sample_transaction
+
+    transaction_repository.delete_transaction(duplicate_transaction.id)
+    assert transaction_repository.get_transaction_by_hash_and_network(
+        sample_transaction.hash, sample_transaction.network
+    ) == sample_transaction
+
+
 def test_delete_transaction(transaction_repository: InMemoryTransactionRepository, sample_transaction: Transaction):
     """Test deleting a transaction."""
     transaction_repository.save_transaction(sample_transaction)
@@ -57,3 +57,12 @@ def test_encrypt_empty_data(security_provider: FernetSecurityProvider):
     encrypted_data = security_provider.encrypt_bytes(data)
     decrypted_data = security_provider.decrypt_bytes(encrypted_data)
     assert decrypted_data == data
+
+
+def test_encrypt_many(security_provider: FernetSecurityProvider):
+    """
+    Test that many items can be encrypted in one call.
+    """
+    items = [b"first", b"", b"third"]
+    encrypted_items = security_provider.encrypt_many(items)
+    assert [security_provider.decrypt_bytes(item) for item in encrypted_items] == items
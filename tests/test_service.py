@@ -0,0 +1,833 @@
+"""
+Tests for the CryptoPaymentsService.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from cryptography.fernet import Fernet
+
+from cryptopay.enums import InvoiceStatus
+from cryptopay.exceptions import InvoiceNotFound, WalletNotFound
+from cryptopay.interfaces import BlockchainReader, ExchangeRateProvider, NetworkClient, WalletRepository
+from cryptopay.models import ExchangeRate, FiatInvoiceRequest, Invoice, Transaction, Wallet, WalletCredentials
+from cryptopay.repositories import (
+    InMemoryExchangeRateRepository,
+    InMemoryInvoiceRepository,
+    InMemoryTransactionRepository,
+)
+from cryptopay.security.fernet_security_provider import FernetSecurityProvider
+from cryptopay.service import CryptoPaymentsService, _now
+
+NETWORK = "erc20"
+
+
+class StubWalletRepository(WalletRepository):
+    """Wallet repository keeping wallets in a dictionary and counting lookups."""
+
+    def __init__(self):
+        self.wallets: Dict[Tuple[int, str], Wallet] = {}
+        self.single_lookups = 0
+        self.bulk_lookups = 0
+
+    def get_wallet_for_user(self, user_id: int, network: str) -> Optional[Wallet]:
+        self.single_lookups += 1
+        return self.wallets.get((user_id, network))
+
+    def get_wallets_for_users(self, user_ids: List[int], network: str) -> List[Wallet]:
+        self.bulk_lookups += 1
+        return [self.wallets[(user_id, network)] for user_id in user_ids if (user_id, network) in self.wallets]
+
+    def get_or_create_wallet(self, user_id: int, network: str, wallet_factory) -> Wallet:
+        wallet = self.wallets.get((user_id, network))
+        return wallet if wallet is not None else self.save_wallet(wallet_factory())
+
+    def save_wallet(self, wallet: Wallet) -> Wallet:
+        wallet = wallet.model_copy(update={"id": len(self.wallets) + 1})
+        self.wallets[(wallet.user_id, wallet.network)] = wallet
+        return wallet
+
+    def get_wallet_by_id(self, wallet_id: int) -> Optional[Wallet]:
+        return next((wallet for wallet in self.wallets.values() if wallet.id == wallet_id), None)
+
+    def get_wallets_by_user(self, user_id: int) -> list[Wallet]:
+        return [wallet for wallet in self.wallets.values() if wallet.user_id == user_id]
+
+
+class StubBlockchainReader(BlockchainReader):
+    """Blockchain reader returning preset transactions by invoice ID and counting lookups."""
+
+    def __init__(self):
+        self.transactions: Dict[int, Transaction] = {}
+        self.current_block = 1
+        self.lookups = 0
+        self.block_requests = 0
+
+    def search_transactions_for_wallet(self, wallet: Wallet, invoice: Invoice) -> Optional[Transaction]:
+        self.lookups += 1
+        return self.transactions.get(invoice.id)
+
+    def search_transactions_for_wallets(
+        self, wallets_with_invoices: List[Tuple[Wallet, Invoice]]
+    ) -> Dict[int, Transaction]:
+        self.lookups += 1
+        return {
+            invoice.id: self.transactions[invoice.id]
+            for _, invoice in wallets_with_invoices
+            if invoice.id in self.transactions
+        }
+
+    def is_network_available(self, network: str) -> bool:
+        return True
+
+    def get_current_block(self, network: str) -> int:
+        self.block_requests += 1
+        return self.current_block
+
+
+class SingleLookupBlockchainReader(BlockchainReader):
+    """Blockchain reader implementing only the single-item lookups, like a reader written before batching."""
+
+    def __init__(self):
+        self.transactions: Dict[int, Transaction] = {}
+        self.lookups = 0
+
+    def search_transactions_for_wallet(self, wallet: Wallet, invoice: Invoice) -> Optional[Transaction]:
+        self.lookups += 1
+        return self.transactions.get(invoice.id)
+
+    def is_network_available(self, network: str) -> bool:
+        return True
+
+
+class StubNetworkClient(NetworkClient):
+    """Network client generating numbered wallets and recording transferred private keys."""
+
+    def __init__(self):
+        self.generated_wallets = 0
+        self.transferred_private_keys: List[bytes] = []
+        self.private_key_buffers: List[bytearray] = []
+
+    def get_network_name(self) -> str:
+        return "ETH"
+
+    def generate_wallet(self) -> WalletCredentials:
+        self.generated_wallets += 1
+        return WalletCredentials(
+            address=f"0xaddress{self.generated_wallets}",
+            private_key=f"private-key-{self.generated_wallets}".encode(),
+            network=NETWORK
+        )
+
+    def transfer_amount(self, private_key: bytearray, to_address: str, amount: Decimal, **kwargs) -> str:
+        self.transferred_private_keys.append(bytes(private_key))
+        self.private_key_buffers.append(private_key)
+        return "0xtransfer"
+
+
+class StubExchangeRateProvider(ExchangeRateProvider):
+    """Exchange rate provider returning a fixed rate and counting requests."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def _rate(self, fiat_currency: str, crypto_currency: str) -> ExchangeRate:
+        return ExchangeRate(
+            id=None,
+            rate=Decimal("2000"),
+            reverted_rate=Decimal("0.0005"),
+            fiat_currency=fiat_currency,
+            crypto_currency=crypto_currency,
+            last_updated_at=_now()
+        )
+
+    def get_exchange_rate(self, fiat_currency: str, crypto_currency: str) -> ExchangeRate:
+        self.requests += 1
+        return self._rate(fiat_currency, crypto_currency)
+
+    def get_exchange_rates(self, pairs: List[Tuple[str, str]]) -> List[ExchangeRate]:
+        self.requests += 1
+        return [self._rate(fiat_currency, crypto_currency) for fiat_currency, crypto_currency in pairs]
+
+    def get_supported_fiat_currencies(self) -> List[str]:
+        return ["USD", "EUR"]
+
+    def get_supported_crypto_currencies(self) -> List[str]:
+        return ["ETH"]
+
+
+@pytest.fixture
+def wallet_repository() -> StubWalletRepository:
+    """Fixture to provide a StubWalletRepository instance."""
+    return StubWalletRepository()
+
+
+@pytest.fixture
+def transaction_repository() -> InMemoryTransactionRepository:
+    """Fixture to provide an InMemoryTransactionRepository instance."""
+    return InMemoryTransactionRepository()
+
+
+@pytest.fixture
+def invoice_repository(
+    transaction_repository: InMemoryTransactionRepository,
+    wallet_repository: StubWalletRepository
+) -> InMemoryInvoiceRepository:
+    """Fixture to provide an InMemoryInvoiceRepository sharing the service's other repositories."""
+    return InMemoryInvoiceRepository(transaction_repository, wallet_repository)
+
+
+@pytest.fixture
+def exchange_rate_repository() -> InMemoryExchangeRateRepository:
+    """Fixture to provide an InMemoryExchangeRateRepository instance."""
+    return InMemoryExchangeRateRepository()
+
+
+@pytest.fixture
+def blockchain_reader() -> StubBlockchainReader:
+    """Fixture to provide a StubBlockchainReader instance."""
+    return StubBlockchainReader()
+
+
+@pytest.fixture
+def network_client() -> StubNetworkClient:
+    """Fixture to provide a StubNetworkClient instance."""
+    return StubNetworkClient()
+
+
+@pytest.fixture
+def exchange_rate_provider() -> StubExchangeRateProvider:
+    """Fixture to provide a StubExchangeRateProvider instance."""
+    return StubExchangeRateProvider()
+
+
+@pytest.fixture
+def security_provider() -> FernetSecurityProvider:
+    """Fixture to provide a FernetSecurityProvider instance."""
+    return FernetSecurityProvider(Fernet.generate_key())
+
+
+@pytest.fixture
+def make_service(
+    wallet_repository: StubWalletRepository,
+    invoice_repository: InMemoryInvoiceRepository,
+    exchange_rate_repository: InMemoryExchangeRateRepository,
+    transaction_repository: InMemoryTransactionRepository,
+    blockchain_reader: StubBlockchainReader,
+    network_client: StubNetworkClient,
+    security_provider: FernetSecurityProvider,
+    exchange_rate_provider: StubExchangeRateProvider
+):
+    """Fixture to provide a factory of services built from the stub dependencies."""
+    def make(**kwargs) -> CryptoPaymentsService:
+        return CryptoPaymentsService(
+            wallet_repository=wallet_repository,
+            invoice_repository=invoice_repository,
+            exchange_rate_repository=exchange_rate_repository,
+            transaction_repository=transaction_repository,
+            blockchain_reader=blockchain_reader,
+            network_client=network_client,
+            security_provider=security_provider,
+            exchange_rate_provider=exchange_rate_provider,
+            **kwargs
+        )
+    return make
+
+
+@pytest.fixture
+def service(make_service) -> CryptoPaymentsService:
+    """Fixture to provide a CryptoPaymentsService with default settings."""
+    return make_service()
+
+
+def save_pending_invoice(
+    invoice_repository: InMemoryInvoiceRepository,
+    invoice_id: int,
+    user_id: int = 1,
+    expires_at: Optional[int] = None,
+    network: str = NETWORK
+) -> Invoice:
+    """Save a PENDING invoice with the given ID."""
+    return invoice_repository.save_invoice(Invoice(
+        id=invoice_id,
+        user_id=user_id,
+        created_at=_now(),
+        expires_at=expires_at,
+        crypto_amount=Decimal("1"),
+        crypto_currency="ETH",
+        network=network
+    ))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture to provide a settable clock used by the service instead of the system time."""
+    class Clock:
+        now = 1_700_000_000
+
+    monkeypatch.setattr("cryptopay.service._now", lambda: Clock.now)
+    return Clock
+
+
+def save_wallet(service: CryptoPaymentsService, user_id: int = 1) -> Wallet:
+    """Create the user's wallet through the service."""
+    return service.get_wallet_for_user(user_id, NETWORK)
+
+
+def paying_transaction(invoice_id: int, tx_hash: str) -> Transaction:
+    """Build a transaction paying the invoice."""
+    return Transaction(id=invoice_id, invoice_id=invoice_id, hash=tx_hash, network=NETWORK)
+
+
+def test_transaction_pays_one_invoice_across_check_paths(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: StubBlockchainReader
+):
+    """Test that a transaction recorded by a single check cannot pay another invoice in a pending check."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1)
+    save_pending_invoice(invoice_repository, 2)
+    blockchain_reader.transactions = {1: paying_transaction(1, "0xdup"), 2: paying_transaction(2, "0xdup")}
+
+    assert service.check_invoice_status(1).status == InvoiceStatus.PAID
+    assert service.transaction_repository.get_transaction_by_hash_and_network("0xdup", NETWORK)
+
+    assert service.check_pending_invoices(NETWORK) == []
+    assert service.get_invoice_status(2) == InvoiceStatus.PENDING
+
+
+@pytest.mark.parametrize("invoice_repository", [InMemoryInvoiceRepository(InMemoryTransactionRepository())])
+def test_service_requires_the_transaction_repository_payments_are_recorded_in(make_service):
+    """Test that a transaction repository other than the invoice repository's one is rejected."""
+    with pytest.raises(ValueError):
+        make_service()
+
+
+def test_create_fiat_invoice_converts_exactly(service: CryptoPaymentsService):
+    """Test that fiat amounts are converted with exact Decimal arithmetic."""
+    invoice = service.create_fiat_invoice(1, NETWORK, Decimal("12.345"), "USD")
+    assert invoice.crypto_amount == Decimal("0.0061725")
+    assert invoice.fiat_currency == "USD"
+
+
+def test_exchange_rate_is_reused_within_the_ttl(
+    service: CryptoPaymentsService,
+    exchange_rate_provider: StubExchangeRateProvider
+):
+    """Test that invoices created within the rate TTL share one provider request."""
+    service.create_fiat_invoice(1, NETWORK, Decimal("10"), "USD")
+    service.create_fiat_invoice(1, NETWORK, Decimal("20"), "usd")
+    assert exchange_rate_provider.requests == 1
+
+
+def test_exchange_rate_is_fetched_again_once_the_ttl_is_over(
+    make_service,
+    exchange_rate_provider: StubExchangeRateProvider
+):
+    """Test that a rate older than the TTL is not reused from memory or the repository."""
+    service = make_service(rate_ttl_s=0)
+    service.create_fiat_invoice(1, NETWORK, Decimal("10"), "USD")
+    service.create_fiat_invoice(1, NETWORK, Decimal("20"), "USD")
+    assert exchange_rate_provider.requests == 2
+
+
+@pytest.mark.parametrize("age, provider_requests", [(10, 0), (30, 1)])
+def test_stored_exchange_rate_is_used_while_fresh(
+    service: CryptoPaymentsService,
+    exchange_rate_repository: InMemoryExchangeRateRepository,
+    exchange_rate_provider: StubExchangeRateProvider,
+    clock,
+    age: int,
+    provider_requests: int
+):
+    """Test that a rate stored by another process is used without the provider until it is older than the TTL."""
+    exchange_rate_repository.save_exchange_rate(ExchangeRate(
+        id=1,
+        rate=Decimal("1000"),
+        reverted_rate=Decimal("0.001"),
+        fiat_currency="USD",
+        crypto_currency="ETH",
+        last_updated_at=clock.now - age
+    ))
+
+    invoice = service.create_fiat_invoice(1, NETWORK, Decimal("10"), "USD")
+
+    assert exchange_rate_provider.requests == provider_requests
+    assert invoice.crypto_amount == (Decimal("0.01") if provider_requests == 0 else Decimal("0.005"))
+
+
+def test_warm_rates_fetches_all_currencies_at_once(
+    service: CryptoPaymentsService,
+    exchange_rate_repository: InMemoryExchangeRateRepository,
+    exchange_rate_provider: StubExchangeRateProvider
+):
+    """Test that warmed up rates are fetched by one request, stored and reused by new invoices."""
+    service.warm_rates(["USD", "EUR"])
+    assert exchange_rate_provider.requests == 1
+    assert exchange_rate_repository.get_exchange_rate("USD", "ETH")
+    assert exchange_rate_repository.get_exchange_rate("EUR", "ETH")
+
+    service.create_fiat_invoice(1, NETWORK, Decimal("10"), "USD")
+    service.create_fiat_invoice(1, NETWORK, Decimal("10"), "EUR")
+    assert exchange_rate_provider.requests == 1
+
+
+def test_check_pending_invoices_pays_and_expires_invoices_of_the_network(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: StubBlockchainReader,
+    clock
+):
+    """Test that a pending check pays and expires invoices of its network only, by one batched lookup."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1)
+    save_pending_invoice(invoice_repository, 2, expires_at=clock.now - 1)
+    save_pending_invoice(invoice_repository, 3)
+    save_pending_invoice(invoice_repository, 4, expires_at=clock.now - 1, network="trc20")
+    blockchain_reader.transactions = {1: paying_transaction(1, "0xpaid"), 4: paying_transaction(4, "0xother")}
+
+    updated_invoices = service.check_pending_invoices(NETWORK)
+
+    assert {invoice.id: invoice.status for invoice in updated_invoices} == {
+        1: InvoiceStatus.PAID,
+        2: InvoiceStatus.EXPIRED,
+    }
+    assert blockchain_reader.lookups == 1
+    assert service.get_invoice_status(3) == InvoiceStatus.PENDING
+    assert service.get_invoice_status(4) == InvoiceStatus.PENDING
+
+
+def test_backoff_skips_lookups_until_a_new_block(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: StubBlockchainReader,
+    clock
+):
+    """Test that a backing off invoice is looked up again only once a new block arrives."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1)
+
+    service.check_invoice_status(1)
+    assert (blockchain_reader.lookups, blockchain_reader.block_requests) == (1, 0)
+
+    # Inside the back-off window the first known tip is new to the invoice
+    clock.now += 1
+    service.check_invoice_status(1)
+    assert (blockchain_reader.lookups, blockchain_reader.block_requests) == (2, 1)
+
+    clock.now += 1
+    service.check_invoice_status(1)
+    assert (blockchain_reader.lookups, blockchain_reader.block_requests) == (2, 2)
+
+    blockchain_reader.current_block = 2
+    service.check_invoice_status(1)
+    assert blockchain_reader.lookups == 3
+
+
+def test_backoff_is_tracked_per_invoice(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: StubBlockchainReader,
+    clock
+):
+    """Test that another invoice seeing a new block does not make an invoice skip that block."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1)
+    save_pending_invoice(invoice_repository, 2)
+    service.check_invoice_status(1)
+    service.check_invoice_status(2)
+
+    clock.now += 1
+    service.check_invoice_status(1)
+    blockchain_reader.current_block = 2
+    service.check_invoice_status(2)
+
+    blockchain_reader.transactions[1] = paying_transaction(1, "0xpaid")
+    assert service.check_invoice_status(1).status == InvoiceStatus.PAID
+
+
+def test_backoff_doubles_up_to_the_cap_and_resets_on_payment(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: StubBlockchainReader,
+    clock
+):
+    """Test that the back-off doubles on every miss up to MAX_CHECK_BACKOFF and is dropped once paid."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1)
+
+    backoffs = []
+    for block in range(1, 10):
+        blockchain_reader.current_block = block
+        service.check_invoice_status(1)
+        backoffs.append(service._next_check_at[1] - clock.now)
+    assert backoffs == [5, 10, 20, 40, 80, 160, 300, 300, 300]
+
+    # The tip is unchanged, so only the end of the back-off window triggers a lookup
+    lookups = blockchain_reader.lookups
+    clock.now += 299
+    service.check_invoice_status(1)
+    assert blockchain_reader.lookups == lookups
+    clock.now += 1
+    service.check_invoice_status(1)
+    assert blockchain_reader.lookups == lookups + 1
+
+    blockchain_reader.transactions[1] = paying_transaction(1, "0xpaid")
+    blockchain_reader.current_block += 1
+    assert service.check_invoice_status(1).status == InvoiceStatus.PAID
+    assert 1 not in service._next_check_at
+    assert 1 not in service._last_searched_block
+
+
+@pytest.mark.parametrize("blockchain_reader", [SingleLookupBlockchainReader()])
+def test_single_lookup_blockchain_reader_is_supported(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: SingleLookupBlockchainReader,
+    clock
+):
+    """Test that a reader without batch lookups or a chain tip is never skipped and can pay in bulk."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1)
+    save_pending_invoice(invoice_repository, 2)
+
+    service.check_invoice_status(1)
+    clock.now += 1
+    service.check_invoice_status(1)
+    assert blockchain_reader.lookups == 2
+
+    blockchain_reader.transactions = {1: paying_transaction(1, "0xpaid1"), 2: paying_transaction(2, "0xpaid2")}
+    assert [invoice.id for invoice in service.check_pending_invoices(NETWORK)] == [1, 2]
+
+
+def test_check_pending_invoices_does_not_expire_a_paid_invoice(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    clock
+):
+    """Test that an invoice paid after the PENDING invoices were read is not marked EXPIRED."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1, expires_at=clock.now - 1)
+    get_invoices_by_status_and_network = invoice_repository.get_invoices_by_status_and_network
+
+    def pay_after_read(status, network):
+        invoices = list(get_invoices_by_status_and_network(status, network))
+        invoice_repository.finalize_payment(1, paying_transaction(1, "0xpaid"))
+        return iter(invoices)
+
+    invoice_repository.get_invoices_by_status_and_network = pay_after_read
+
+    assert service.check_pending_invoices(NETWORK) == []
+    assert service.get_invoice_status(1) == InvoiceStatus.PAID
+
+
+def test_status_checks_do_not_expire_a_paid_invoice(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    clock
+):
+    """Test that an invoice paid after a single or batch status check read it is reported PAID, not EXPIRED."""
+    save_pending_invoice(invoice_repository, 1, expires_at=clock.now - 1)
+    save_pending_invoice(invoice_repository, 2, expires_at=clock.now - 1)
+    get_invoice_with_wallet = invoice_repository.get_invoice_with_wallet
+    get_invoices_by_ids = invoice_repository.get_invoices_by_ids
+
+    def pay_after_read_with_wallet(invoice_id):
+        invoice_with_wallet = get_invoice_with_wallet(invoice_id)
+        invoice_repository.finalize_payment(invoice_id, paying_transaction(invoice_id, f"0xpaid{invoice_id}"))
+        return invoice_with_wallet
+
+    def pay_after_read_by_ids(invoice_ids):
+        invoices = get_invoices_by_ids(invoice_ids)
+        for invoice_id in invoice_ids:
+            invoice_repository.finalize_payment(invoice_id, paying_transaction(invoice_id, f"0xpaid{invoice_id}"))
+        return invoices
+
+    invoice_repository.get_invoice_with_wallet = pay_after_read_with_wallet
+    invoice_repository.get_invoices_by_ids = pay_after_read_by_ids
+
+    assert service.check_invoice_status(1).status == InvoiceStatus.PAID
+    assert [invoice.status for invoice in asyncio.run(service.check_invoices_status([2]))] == [InvoiceStatus.PAID]
+    assert invoice_repository.get_invoice_by_id(1).status == InvoiceStatus.PAID
+    assert invoice_repository.get_invoice_by_id(2).status == InvoiceStatus.PAID
+
+
+def test_check_pending_invoices_drops_the_backoff_of_expired_invoices(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    clock
+):
+    """Test that invoices expired by a pending check leave no back-off state behind."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1, expires_at=clock.now + 1)
+    service.check_invoice_status(1)
+    assert 1 in service._next_check_at
+
+    clock.now += 2
+    assert [invoice.status for invoice in service.check_pending_invoices(NETWORK)] == [InvoiceStatus.EXPIRED]
+    assert 1 not in service._next_check_at
+    assert 1 not in service._check_backoff
+    assert 1 not in service._last_searched_block
+
+
+def test_background_wallet_provisioning_failure_is_logged(
+    make_service,
+    network_client: StubNetworkClient,
+    wallet_repository: StubWalletRepository,
+    caplog
+):
+    """Test that a failed background wallet provisioning is logged instead of silently dropped."""
+    def generate_wallet():
+        raise ConnectionError("node unavailable")
+
+    network_client.generate_wallet = generate_wallet
+    service = make_service(auto_provision_wallet=False)
+
+    invoice = service.create_crypto_invoice(1, NETWORK, Decimal("1"), "ETH")
+    service.close()
+
+    assert invoice.status == InvoiceStatus.PENDING
+    assert wallet_repository.wallets == {}
+    assert "Provisioning wallet for user 1 on network erc20 failed" in caplog.text
+    assert "node unavailable" in caplog.text
+
+
+def test_check_invoices_status_reports_failures_per_invoice(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: StubBlockchainReader
+):
+    """Test that a failing invoice is reported in its place instead of aborting the batch."""
+    save_wallet(service, user_id=1)
+    save_pending_invoice(invoice_repository, 1, user_id=1)
+    save_pending_invoice(invoice_repository, 2, user_id=2)
+    blockchain_reader.transactions[1] = paying_transaction(1, "0xpaid")
+
+    paid, missing_wallet, missing_invoice = asyncio.run(service.check_invoices_status([1, 2, 99]))
+
+    assert paid.status == InvoiceStatus.PAID
+    assert isinstance(missing_wallet, WalletNotFound) and missing_wallet.user_id == 2
+    assert isinstance(missing_invoice, InvoiceNotFound) and missing_invoice.invoice_id == 99
+
+
+def test_check_invoices_status_checks_a_repeated_invoice_once(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    blockchain_reader: StubBlockchainReader
+):
+    """Test that an invoice requested twice is checked once and reported as paid at both positions."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1)
+    blockchain_reader.transactions[1] = paying_transaction(1, "0xpaid")
+
+    invoices = asyncio.run(service.check_invoices_status([1, 1]))
+
+    assert [invoice.status for invoice in invoices] == [InvoiceStatus.PAID, InvoiceStatus.PAID]
+    assert blockchain_reader.lookups == 1
+
+
+def test_check_invoices_status_loads_wallets_in_bulk_off_the_event_loop(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    wallet_repository: StubWalletRepository
+):
+    """Test that wallets are loaded by one bulk call and sync repositories run in worker threads."""
+    for user_id in (1, 2, 3):
+        save_wallet(service, user_id)
+        save_pending_invoice(invoice_repository, user_id, user_id=user_id)
+
+    repository_threads = set()
+    get_invoices_by_ids = invoice_repository.get_invoices_by_ids
+
+    def record_thread(invoice_ids):
+        repository_threads.add(threading.get_ident())
+        return get_invoices_by_ids(invoice_ids)
+
+    invoice_repository.get_invoices_by_ids = record_thread
+    invoices = asyncio.run(service.check_invoices_status([1, 2, 3]))
+
+    assert [invoice.id for invoice in invoices] == [1, 2, 3]
+    assert (wallet_repository.bulk_lookups, wallet_repository.single_lookups) == (1, 0)
+    assert threading.get_ident() not in repository_threads
+
+
+def test_create_fiat_invoices_in_bulk(
+    service: CryptoPaymentsService,
+    wallet_repository: StubWalletRepository,
+    exchange_rate_provider: StubExchangeRateProvider
+):
+    """Test that bulk invoices get their own IDs and amounts, with one rate request per fiat currency."""
+    invoices = service.create_fiat_invoices([
+        FiatInvoiceRequest(user_id=1, network=NETWORK, fiat_amount=Decimal("10"), fiat_currency="USD"),
+        FiatInvoiceRequest(user_id=2, network=NETWORK, fiat_amount=Decimal("20"), fiat_currency="USD"),
+        FiatInvoiceRequest(user_id=1, network=NETWORK, fiat_amount=Decimal("30"), fiat_currency="EUR"),
+    ])
+
+    assert len({invoice.id for invoice in invoices}) == 3
+    assert [invoice.crypto_amount for invoice in invoices] == [Decimal("0.005"), Decimal("0.01"), Decimal("0.015")]
+    assert [service.get_invoice_status(invoice.id) for invoice in invoices] == [InvoiceStatus.PENDING] * 3
+    assert exchange_rate_provider.requests == 2
+    assert set(wallet_repository.wallets) == {(1, NETWORK), (2, NETWORK)}
+
+
+def test_create_fiat_invoices_keeps_concurrently_created_wallets(
+    service: CryptoPaymentsService,
+    wallet_repository: StubWalletRepository,
+    network_client: StubNetworkClient
+):
+    """Test that bulk wallet creation keeps a wallet saved after its bulk read instead of adding another."""
+    existing_wallet = save_wallet(service, user_id=2)
+    # The wallet of user 2 is created concurrently, after the bulk read
+    wallet_repository.get_wallets_for_users = lambda user_ids, network: []
+
+    service.create_fiat_invoices([
+        FiatInvoiceRequest(user_id=user_id, network=NETWORK, fiat_amount=Decimal("10"), fiat_currency="USD")
+        for user_id in (1, 2)
+    ])
+
+    assert network_client.generated_wallets == 3
+    assert wallet_repository.wallets[(2, NETWORK)] == existing_wallet
+    assert wallet_repository.wallets[(1, NETWORK)].address != existing_wallet.address
+
+
+def test_final_invoices_are_answered_from_memory_until_forgotten(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    clock
+):
+    """Test that final invoices skip the repository until they are forgotten."""
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1, expires_at=clock.now - 1)
+    assert service.check_invoice_status(1).status == InvoiceStatus.EXPIRED
+
+    invoice_repository.delete_invoice(1)
+    assert service.check_invoice_status(1).status == InvoiceStatus.EXPIRED
+    assert service.get_invoice_status(1) == InvoiceStatus.EXPIRED
+
+    service.forget_invoice(1)
+    with pytest.raises(InvoiceNotFound):
+        service.check_invoice_status(1)
+    with pytest.raises(InvoiceNotFound):
+        service.get_invoice_status(1)
+
+
+def test_final_invoices_in_memory_are_not_changed_through_returned_invoices(
+    service: CryptoPaymentsService,
+    invoice_repository: InMemoryInvoiceRepository,
+    clock
+):
+    """Test that changing a returned final invoice in place does not change later answers from memory."""
+    save_pending_invoice(invoice_repository, 1, expires_at=clock.now - 1)
+    service.check_invoice_status(1).status = InvoiceStatus.PENDING
+    service.check_invoice_status(1).status = InvoiceStatus.PENDING
+
+    assert service.check_invoice_status(1).status == InvoiceStatus.EXPIRED
+    assert service.get_invoice_status(1) == InvoiceStatus.EXPIRED
+
+
+def test_final_invoice_cache_can_be_disabled(
+    make_service,
+    invoice_repository: InMemoryInvoiceRepository,
+    clock
+):
+    """Test that a disabled cache reads final invoices from the repository every time."""
+    service = make_service(terminal_invoice_cache_size=0)
+    save_wallet(service)
+    save_pending_invoice(invoice_repository, 1, expires_at=clock.now - 1)
+    assert service.check_invoice_status(1).status == InvoiceStatus.EXPIRED
+
+    invoice_repository.delete_invoice(1)
+    with pytest.raises(InvoiceNotFound):
+        service.get_invoice_status(1)
+
+
+def test_final_invoice_cache_evicts_the_oldest_invoice(
+    make_service,
+    invoice_repository: InMemoryInvoiceRepository,
+    clock
+):
+    """Test that the cache keeps at most terminal_invoice_cache_size invoices, dropping the oldest."""
+    service = make_service(terminal_invoice_cache_size=2)
+    save_wallet(service)
+    for invoice_id in (1, 2, 3):
+        save_pending_invoice(invoice_repository, invoice_id, expires_at=clock.now - 1)
+
+    results = asyncio.run(service.check_invoices_status([1, 2, 3]))
+    assert [invoice.status for invoice in results] == [InvoiceStatus.EXPIRED] * 3
+
+    for invoice_id in (1, 2, 3):
+        invoice_repository.delete_invoice(invoice_id)
+    with pytest.raises(InvoiceNotFound):
+        service.get_invoice_status(1)
+    assert service.get_invoice_status(3) == InvoiceStatus.EXPIRED
+
+
+@pytest.mark.parametrize("private_key_cache_size", [0, 2])
+def test_transfer_zeroes_the_private_key_buffer(
+    make_service,
+    network_client: StubNetworkClient,
+    security_provider: FernetSecurityProvider,
+    private_key_cache_size: int
+):
+    """Test that the private key handed to the network client is zeroed after every transfer."""
+    service = make_service(private_key_cache_size=private_key_cache_size)
+    save_wallet(service)
+    decrypt_bytes = security_provider.decrypt_bytes
+    decryptions = []
+
+    def counting_decrypt_bytes(data: bytes) -> bytes:
+        decryptions.append(data)
+        return decrypt_bytes(data)
+
+    security_provider.decrypt_bytes = counting_decrypt_bytes
+
+    for _ in range(2):
+        service.transfer_from_wallet(1, NETWORK, "0xrecipient", Decimal("1"))
+
+    assert network_client.transferred_private_keys == [b"private-key-1"] * 2
+    assert all(buffer == bytearray(len(buffer)) for buffer in network_client.private_key_buffers)
+    assert len(decryptions) == (2 if private_key_cache_size == 0 else 1)
+
+
+def test_private_key_cache_zeroes_evicted_and_cleared_keys(make_service):
+    """Test that keys leaving the cache by eviction or by close are zeroed."""
+    service = make_service(private_key_cache_size=1)
+    save_wallet(service, user_id=1)
+    save_wallet(service, user_id=2)
+
+    service.transfer_from_wallet(1, NETWORK, "0xrecipient", Decimal("1"))
+    [first_key] = service._private_key_cache.values()
+    service.transfer_from_wallet(2, NETWORK, "0xrecipient", Decimal("1"))
+    [second_key] = service._private_key_cache.values()
+    assert first_key == bytearray(len(first_key))
+    assert second_key == bytearray(b"private-key-2")
+
+    service.close()
+    assert second_key == bytearray(len(second_key))
+    assert not service._private_key_cache
+
+
+def test_private_key_cache_keeps_a_concurrently_cached_key(
+    make_service,
+    security_provider: FernetSecurityProvider
+):
+    """Test that a key cached by a concurrent transfer is not overwritten by another copy."""
+    service = make_service(private_key_cache_size=2)
+    wallet = save_wallet(service)
+    concurrently_cached = bytearray(b"private-key-1")
+    decrypt_bytes = security_provider.decrypt_bytes
+
+    def decrypt_while_another_transfer_caches(data: bytes) -> bytes:
+        service._private_key_cache[(wallet.id, wallet.private_key_encrypted)] = concurrently_cached
+        return decrypt_bytes(data)
+
+    security_provider.decrypt_bytes = decrypt_while_another_transfer_caches
+    service.transfer_from_wallet(1, NETWORK, "0xrecipient", Decimal("1"))
+
+    assert list(service._private_key_cache.values()) == [concurrently_cached]
+    assert service._private_key_cache[(wallet.id, wallet.private_key_encrypted)] is concurrently_cached